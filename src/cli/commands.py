@@ -5,59 +5,146 @@ import argparse
 import asyncio
 import sys
 import json
+import re
+import string
+from datetime import datetime, timedelta, timezone
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import List, Optional
 
-# 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-from src.models.subscription import Subscription, NotificationType, UpdateFrequency, UpdateType
-from src.services.subscription_service import SubscriptionService
-from src.services.update_service import UpdateService
-from src.services.notification_service import NotificationService
-from src.services.github_service import GitHubService
-from src.services.llm_service import LLMService, create_azure_openai_provider, create_openai_provider
-from src.services.report_service import ReportService
-from src.config.settings import Settings
+# 直接以脚本方式运行时（python src/cli/commands.py）才需要把项目根目录加入Python路径；
+# 通过安装的入口或 python -m 运行时包已可导入
+if __name__ == "__main__" and __package__ is None:
+    project_root = Path(__file__).parent.parent.parent
+    sys.path.insert(0, str(project_root))
+
+# 服务和模型在各自的属性/处理方法中按需导入，避免 --help 等命令加载HTTP客户端和LLM SDK
+from src.config.settings import Settings, get_settings
 from src.utils.logger import setup_logger
 
+# 参数可选值，模块导入时创建一次
+_FREQUENCY_CHOICES = ('daily', 'weekly', 'both')
+_NOTIFICATION_CHOICES = ('email', 'slack', 'discord', 'webhook')
+_UPDATE_TYPE_CHOICES = ('commits', 'issues', 'pull_requests', 'releases', 'all')
+_FORMAT_CHOICES = ('table', 'json')
 
-class GitHubSentinelCLI:
-    """GitHub Sentinel 命令行界面"""
+# 仓库URL解析
+_GITHUB_PREFIX = 'https://github.com/'
+_REPO_PART_CHARS = frozenset(string.ascii_letters + string.digits + '_.-')
+_REPO_RE = re.compile(r'github\.com[/:]([\w\.-]+)/([\w\.-]+?)(?:\.git)?/?$')
 
-    def __init__(self):
-        self.settings = Settings.from_env()  # 优先从环境变量加载
-        try:
-            # 尝试从配置文件加载（如果存在）
-            file_settings = Settings.from_config_file()
-            # 合并配置（环境变量优先）
-            if not self.settings.github.token and file_settings.github.token:
-                self.settings = file_settings
-        except Exception:
-            pass
-
-        self.logger = setup_logger(self.settings.log_level, self.settings.log_file)
-
-        # 初始化服务
-        self.github_service = GitHubService(
+
+@lru_cache(maxsize=None)
+def _shared_arguments() -> dict:
+    """多个子命令共用的参数组，作为 parents 传入，每组参数只声明一次"""
+    repo = argparse.ArgumentParser(add_help=False)
+    repo.add_argument('owner', help='仓库所有者')
+    repo.add_argument('repo', help='仓库名称')
+
+    llm = argparse.ArgumentParser(add_help=False)
+    llm.add_argument('--template', default='github_azure_prompt.txt',
+                     help='使用的提示模板')
+    llm.add_argument('--provider', help='LLM提供商名称')
+
+    generation = argparse.ArgumentParser(add_help=False)
+    generation.add_argument('--temperature', type=float, default=0.7,
+                            help='LLM温度参数')
+    generation.add_argument('--max-tokens', type=int, default=1500,
+                            help='最大生成令牌数（默认1500以节省成本）')
+
+    hours = argparse.ArgumentParser(add_help=False)
+    hours.add_argument('--hours', type=int, default=24,
+                       help='时间范围（小时），默认24小时')
+
+    return {'repo': repo, 'llm': llm, 'generation': generation, 'hours': hours}
+
+
+class GitHubSentinelCLI:
+    """GitHub Sentinel 命令行界面
+
+    配置和各个服务都在首次访问时才创建，`--help` 或只用到部分服务的命令
+    不必为其余服务付出初始化开销。
+    """
+
+    # 是否使用配置解析缓存、GitHub ETag存储和LLM响应缓存，由 --no-cache 关闭
+    use_cache = True
+    # 各服务共享的HTTP连接（GitHub/Webhook 用 aiohttp，LLM 提供商用 httpx）
+    _http_session = None
+    _llm_http_client = None
+
+    @cached_property
+    def settings(self) -> Settings:
+        """加载配置（首次访问时），环境变量优先于配置文件"""
+        if not self.use_cache:
+            return Settings.from_config_file(use_cache=False)
+        return get_settings()
+
+    @cached_property
+    def logger(self):
+        """日志器"""
+        # 命令行单次运行，文件日志批量写入，退出时刷新
+        return setup_logger(self.settings.log_level, self.settings.log_file, buffered=True)
+
+    @cached_property
+    def github_service(self):
+        """GitHub API 服务"""
+        from src.services.github_service import GitHubService
+        from src.services.etag_store import EtagStore
+        return GitHubService(
             token=self.settings.github.token,
             rate_limit_per_hour=self.settings.github.rate_limit_per_hour,
-            timeout=self.settings.github.timeout
+            timeout=self.settings.github.timeout,
+            session=self._get_http_session(),
+            etag_store=EtagStore() if self.use_cache else None
         )
 
-        self.llm_service = LLMService()
-        self._setup_llm_providers()
-
-        self.report_service = ReportService(self.llm_service, self.github_service)
+    @cached_property
+    def llm_service(self):
+        """LLM 服务（含已配置的提供商）"""
+        from src.services.llm_service import LLMService
+        from src.services.llm_cache import LLMResponseCache
+        llm_service = LLMService(cache=LLMResponseCache() if self.use_cache else None)
+        self._setup_llm_providers(llm_service)
+        return llm_service
+
+    @cached_property
+    def report_service(self):
+        """报告生成服务"""
+        from src.services.report_service import ReportService
+        return ReportService(self.llm_service, self.github_service)
+
+    # 传统服务
+    @cached_property
+    def subscription_service(self):
+        """订阅管理服务"""
+        from src.services.subscription_service import SubscriptionService
+        return SubscriptionService(self.settings)
+
+    @cached_property
+    def update_service(self):
+        """更新获取服务"""
+        from src.services.update_service import UpdateService
+        return UpdateService(self.settings, github_service=self.github_service)
+
+    @cached_property
+    def notification_service(self):
+        """通知服务"""
+        from src.services.notification_service import NotificationService
+        return NotificationService(self.settings, session=self._get_http_session())
+
+    def _setup_llm_providers(self, llm_service):
+        """设置LLM提供商"""
+        from src.services.llm_service import create_azure_openai_provider, create_openai_provider
 
-        # 传统服务
-        self.subscription_service = SubscriptionService(self.settings)
-        self.update_service = UpdateService(self.settings)
-        self.notification_service = NotificationService(self.settings)
+        if self.settings.llm_providers and self._llm_http_client is None:
+            import httpx
+            # 所有提供商共用一个连接池，避免每个客户端各自握手
+            self._llm_http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                timeout=httpx.Timeout(600.0, connect=5.0),
+                follow_redirects=True
+            )
 
-    def _setup_llm_providers(self):
-        """设置LLM提供商"""
         for provider_config in self.settings.llm_providers:
             try:
                 if provider_config.type == "azure_openai":
@@ -65,18 +152,20 @@ class GitHubSentinelCLI:
                         'model_name': provider_config.model_name,
                         'api_key': provider_config.api_key,
                         'azure_endpoint': provider_config.azure_endpoint,
-                        'api_version': provider_config.api_version
+                        'api_version': provider_config.api_version,
+                        'http_client': self._llm_http_client
                     })
                 elif provider_config.type == "openai":
                     provider = create_openai_provider({
                         'model_name': provider_config.model_name,
-                        'api_key': provider_config.api_key
+                        'api_key': provider_config.api_key,
+                        'http_client': self._llm_http_client
                     })
                 else:
                     self.logger.warning(f"不支持的LLM提供商类型: {provider_config.type}")
                     continue
 
-                self.llm_service.add_provider(
+                llm_service.add_provider(
                     provider_config.name,
                     provider,
                     provider_config.is_default
@@ -86,107 +175,126 @@ class GitHubSentinelCLI:
             except Exception as e:
                 self.logger.error(f"加载LLM提供商 {provider_config.name} 失败: {str(e)}")
 
-    def create_parser(self) -> argparse.ArgumentParser:
-        """创建命令行参数解析器"""
+    # 子命令注册表：名称 -> (帮助信息, 构建方法名, 共享参数组)
+    SUBCOMMANDS = {
+        # === v0.1 传统命令 ===
+        'add': ('添加新的仓库订阅', '_build_add_parser', ()),
+        'list': ('列出所有订阅', '_build_list_parser', ()),
+        'remove': ('删除订阅', '_build_remove_parser', ()),
+        'run': ('手动运行检查', '_build_run_parser', ()),
+        # === v0.2 新功能命令 ===
+        'progress': ('生成仓库每日进展报告', '_build_progress_parser', ('repo', 'hours')),
+        'summary': ('使用LLM生成仓库摘要报告', '_build_summary_parser', ('repo', 'llm', 'generation', 'hours')),
+        'report': ('生成完整的每日报告（进展+摘要）', '_build_report_parser', ('repo', 'llm', 'generation', 'hours')),
+        'batch': ('批量生成多个仓库的报告', '_build_batch_parser', ('llm',)),
+        'compare': ('对比不同模板和模型生成的报告', '_build_compare_parser', ('repo',)),
+        'llm': ('LLM提供商管理', '_build_llm_parser', ()),
+        'history': ('查看报告历史', '_build_history_parser', ()),
+    }
+
+    def create_parser(self, argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+        """创建命令行参数解析器
+
+        传入 argv 时只完整构建其中请求的子命令，其余子命令仅注册名称和帮助信息；
+        未传入或无法识别子命令时构建全部子命令。
+        """
         parser = argparse.ArgumentParser(
             prog='github-sentinel',
             description='GitHub Sentinel - 自动监控GitHub仓库更新和智能报告生成'
         )
+        parser.add_argument('--no-cache', action='store_true',
+                            help='不使用缓存（重新读取配置文件，不读写磁盘上的GitHub ETag缓存，并重新调用LLM而非使用缓存的回复）')
 
         subparsers = parser.add_subparsers(dest='command', help='可用命令')
 
-        # === v0.1 传统命令 ===
-        # 添加订阅命令
-        add_parser = subparsers.add_parser('add', help='添加新的仓库订阅')
-        add_parser.add_argument('repo_url', help='GitHub仓库URL')
-        add_parser.add_argument('--frequency', choices=['daily', 'weekly', 'both'],
-                               default='daily', help='更新频率')
-        add_parser.add_argument('--notifications', nargs='+',
-                               choices=['email', 'slack', 'discord', 'webhook'],
-                               default=['email'], help='通知方式')
-        add_parser.add_argument('--update-types', nargs='+',
-                               choices=['commits', 'issues', 'pull_requests', 'releases', 'all'],
-                               default=['all'], help='监控的更新类型')
-
-        # 列出订阅命令
-        list_parser = subparsers.add_parser('list', help='列出所有订阅')
-        list_parser.add_argument('--format', choices=['table', 'json'],
-                                default='table', help='输出格式')
-
-        # 删除订阅命令
-        remove_parser = subparsers.add_parser('remove', help='删除订阅')
-        remove_parser.add_argument('repo_url', help='要删除的GitHub仓库URL')
-
-        # 手动运行命令
-        run_parser = subparsers.add_parser('run', help='手动运行检查')
-        run_parser.add_argument('--repo', help='指定仓库（可选）')
+        requested = self._peek_command(argv) if argv is not None else None
+        build_all = requested not in self.SUBCOMMANDS
+        for name, (help_text, builder, groups) in self.SUBCOMMANDS.items():
+            if build_all or name == requested:
+                parents = [_shared_arguments()[group] for group in groups]
+                subparser = subparsers.add_parser(name, help=help_text, parents=parents)
+                getattr(self, builder)(subparser)
+            else:
+                subparsers.add_parser(name, help=help_text)
 
-        # === v0.2 新功能命令 ===
-        # 生成每日进展报告
-        progress_parser = subparsers.add_parser('progress', help='生成仓库每日进展报告')
-        progress_parser.add_argument('owner', help='仓库所有者')
-        progress_parser.add_argument('repo', help='仓库名称')
-        progress_parser.add_argument('--output-dir', default='daily_progress',
-                                   help='输出目录 (默认: daily_progress)')
-        progress_parser.add_argument('--hours', type=int, default=24,
-                                   help='时间范围（小时），默认24小时')
-        progress_parser.add_argument('--compact', action='store_true', default=True,
-                                   help='使用紧凑模式（默认开启，只显示merged PR和open issues）')
-        progress_parser.add_argument('--full', action='store_true',
-                                   help='使用完整模式（显示所有详细信息）')
-
-        # 生成LLM摘要报告
-        summary_parser = subparsers.add_parser('summary', help='使用LLM生成仓库摘要报告')
-        summary_parser.add_argument('owner', help='仓库所有者')
-        summary_parser.add_argument('repo', help='仓库名称')
-        summary_parser.add_argument('--template', default='github_azure_prompt.txt',
-                                  help='使用的提示模板')
-        summary_parser.add_argument('--provider', help='LLM提供商名称')
-        summary_parser.add_argument('--temperature', type=float, default=0.7,
-                                  help='LLM温度参数')
-        summary_parser.add_argument('--max-tokens', type=int, default=1500,
-                                  help='最大生成令牌数（默认1500以节省成本）')
-        summary_parser.add_argument('--hours', type=int, default=24,
-                                   help='时间范围（小时），默认24小时')
-
-        # 生成完整报告
-        report_parser = subparsers.add_parser('report', help='生成完整的每日报告（进展+摘要）')
-        report_parser.add_argument('owner', help='仓库所有者')
-        report_parser.add_argument('repo', help='仓库名称')
-        report_parser.add_argument('--template', default='github_azure_prompt.txt',
-                                 help='使用的提示模板')
-        report_parser.add_argument('--provider', help='LLM提供商名称')
-        report_parser.add_argument('--temperature', type=float, default=0.7,
-                                 help='LLM温度参数')
-        report_parser.add_argument('--max-tokens', type=int, default=1500,
-                                 help='最大生成令牌数（默认1500以节省成本）')
-        report_parser.add_argument('--hours', type=int, default=24,
-                                 help='时间范围（小时），默认24小时')
-        report_parser.add_argument('--full', action='store_true',
-                                 help='使用完整模式（显示所有详细信息）')
-
-        # 批量生成报告
-        batch_parser = subparsers.add_parser('batch', help='批量生成多个仓库的报告')
-        batch_parser.add_argument('repos_file', help='包含仓库列表的JSON文件')
-        batch_parser.add_argument('--template', default='github_azure_prompt.txt',
-                                help='使用的提示模板')
-        batch_parser.add_argument('--provider', help='LLM提供商名称')
-        batch_parser.add_argument('--concurrent', type=int, default=3,
-                                help='并发处理数量')
-
-        # 对比不同模板/模型
-        compare_parser = subparsers.add_parser('compare', help='对比不同模板和模型生成的报告')
-        compare_parser.add_argument('owner', help='仓库所有者')
-        compare_parser.add_argument('repo', help='仓库名称')
-        compare_parser.add_argument('--templates', nargs='+',
-                                  default=['github_azure_prompt.txt'],
-                                  help='要对比的模板列表')
-        compare_parser.add_argument('--providers', nargs='+',
-                                  help='要对比的LLM提供商列表')
-
-        # LLM提供商管理
-        llm_parser = subparsers.add_parser('llm', help='LLM提供商管理')
-        llm_subparsers = llm_parser.add_subparsers(dest='llm_action', help='LLM操作')
+        return parser
+
+    @staticmethod
+    def _peek_command(argv: List[str]) -> Optional[str]:
+        """取出参数列表中的第一个位置参数（即子命令名）"""
+        return next((arg for arg in argv if not arg.startswith('-')), None)
+
+    def _build_add_parser(self, parser: argparse.ArgumentParser):
+        """add 子命令"""
+        parser.set_defaults(func=self._handle_add_subscription)
+        parser.add_argument('repo_url', help='GitHub仓库URL')
+        parser.add_argument('--frequency', choices=_FREQUENCY_CHOICES,
+                            default='daily', help='更新频率')
+        parser.add_argument('--notifications', nargs='+',
+                            choices=_NOTIFICATION_CHOICES,
+                            default=['email'], help='通知方式')
+        parser.add_argument('--update-types', nargs='+',
+                            choices=_UPDATE_TYPE_CHOICES,
+                            default=['all'], help='监控的更新类型')
+
+    def _build_list_parser(self, parser: argparse.ArgumentParser):
+        """list 子命令"""
+        parser.set_defaults(func=self._handle_list_subscriptions)
+        parser.add_argument('--format', choices=_FORMAT_CHOICES,
+                            default='table', help='输出格式')
+
+    def _build_remove_parser(self, parser: argparse.ArgumentParser):
+        """remove 子命令"""
+        parser.set_defaults(func=self._handle_remove_subscription)
+        parser.add_argument('repo_url', help='要删除的GitHub仓库URL')
+
+    def _build_run_parser(self, parser: argparse.ArgumentParser):
+        """run 子命令"""
+        parser.set_defaults(func=self._handle_run_check)
+        parser.add_argument('--repo', help='指定仓库（可选）')
+
+    def _build_progress_parser(self, parser: argparse.ArgumentParser):
+        """progress 子命令"""
+        parser.set_defaults(func=self._handle_progress_report)
+        parser.add_argument('--output-dir', default='daily_progress',
+                            help='输出目录 (默认: daily_progress)')
+        parser.add_argument('--compact', action='store_true', default=True,
+                            help='使用紧凑模式（默认开启，只显示merged PR和open issues）')
+        parser.add_argument('--full', action='store_true',
+                            help='使用完整模式（显示所有详细信息）')
+
+    def _build_summary_parser(self, parser: argparse.ArgumentParser):
+        """summary 子命令"""
+        parser.set_defaults(func=self._handle_summary_report)
+
+    def _build_report_parser(self, parser: argparse.ArgumentParser):
+        """report 子命令"""
+        parser.set_defaults(func=self._handle_complete_report)
+        parser.add_argument('--full', action='store_true',
+                            help='使用完整模式（显示所有详细信息）')
+
+    def _build_batch_parser(self, parser: argparse.ArgumentParser):
+        """batch 子命令"""
+        parser.set_defaults(func=self._handle_batch_reports)
+        parser.add_argument('repos_file', help='包含仓库列表的JSON文件')
+        parser.add_argument('--concurrent', type=int, default=3,
+                            help='并发处理数量')
+        parser.add_argument('--use-batch-api', action='store_true',
+                            help='通过提供商的 Batch API 提交摘要请求（费用约减半，但可能需数小时完成，仅支持OpenAI）')
+
+    def _build_compare_parser(self, parser: argparse.ArgumentParser):
+        """compare 子命令"""
+        parser.set_defaults(func=self._handle_compare_reports)
+        parser.add_argument('--templates', nargs='+',
+                            default=['github_azure_prompt.txt'],
+                            help='要对比的模板列表')
+        parser.add_argument('--providers', nargs='+',
+                            help='要对比的LLM提供商列表')
+
+    def _build_llm_parser(self, parser: argparse.ArgumentParser):
+        """llm 子命令"""
+        parser.set_defaults(func=self._handle_llm_commands)
+        llm_subparsers = parser.add_subparsers(dest='llm_action', help='LLM操作')
 
         llm_subparsers.add_parser('list', help='列出所有LLM提供商')
 
@@ -195,44 +303,22 @@ class GitHubSentinelCLI:
         test_parser.add_argument('--prompt', default='Hello, how are you?',
                                help='测试提示')
 
-        # 报告历史管理
-        history_parser = subparsers.add_parser('history', help='查看报告历史')
-        history_parser.add_argument('repo', help='仓库名称')
-        history_parser.add_argument('--limit', type=int, default=10,
-                                  help='显示数量限制')
-
-        return parser
+    def _build_history_parser(self, parser: argparse.ArgumentParser):
+        """history 子命令"""
+        parser.set_defaults(func=self._handle_report_history)
+        parser.add_argument('repo', help='仓库名称')
+        parser.add_argument('--limit', type=int, default=10,
+                            help='显示数量限制')
 
     async def handle_command(self, args):
-        """处理命令"""
-        try:
-            if args.command == 'add':
-                await self._handle_add_subscription(args)
-            elif args.command == 'list':
-                await self._handle_list_subscriptions(args)
-            elif args.command == 'remove':
-                await self._handle_remove_subscription(args)
-            elif args.command == 'run':
-                await self._handle_run_check(args)
-            # v0.2 新命令
-            elif args.command == 'progress':
-                await self._handle_progress_report(args)
-            elif args.command == 'summary':
-                await self._handle_summary_report(args)
-            elif args.command == 'report':
-                await self._handle_complete_report(args)
-            elif args.command == 'batch':
-                await self._handle_batch_reports(args)
-            elif args.command == 'compare':
-                await self._handle_compare_reports(args)
-            elif args.command == 'llm':
-                await self._handle_llm_commands(args)
-            elif args.command == 'history':
-                await self._handle_report_history(args)
-            else:
-                print("未知命令，使用 --help 查看帮助")
-                return 1
+        """处理命令（处理方法由子命令解析器通过 set_defaults(func=...) 绑定）"""
+        func = getattr(args, 'func', None)
+        if func is None:
+            print("未知命令，使用 --help 查看帮助")
+            return 1
 
+        try:
+            await func(args)
         except Exception as e:
             self.logger.error(f"命令执行失败: {str(e)}")
             print(f"错误: {str(e)}")
@@ -240,11 +326,78 @@ class GitHubSentinelCLI:
 
         return 0
 
+    @staticmethod
+    def _emit(*lines: str):
+        """一次性写出多行输出并刷新，代替连续的print调用"""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+    @cached_property
+    def _interactive(self) -> bool:
+        """标准输出是否为交互终端"""
+        return sys.stdout.isatty()
+
+    def _stream(self, line: str):
+        """流式输出一行；输出到管道或文件时不逐行刷新，由随后的 _emit 统一刷新"""
+        sys.stdout.write(line + "\n")
+        if self._interactive:
+            sys.stdout.flush()
+
+    @staticmethod
+    def _emit_json(data):
+        """以缩进JSON输出，安装了 orjson 时直接写出UTF-8字节"""
+        try:
+            import orjson
+        except ImportError:
+            print(json.dumps(data, indent=2, ensure_ascii=False, default=str))
+            return
+
+        out = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE, default=str)
+        buffer = getattr(sys.stdout, 'buffer', None)
+        if buffer is not None:
+            sys.stdout.flush()
+            buffer.write(out)
+        else:
+            sys.stdout.write(out.decode('utf-8'))
+
+    def _get_http_session(self):
+        """各服务共享的 aiohttp 会话，首次创建需要HTTP的服务时才创建
+
+        list、add 等离线命令不会导入 aiohttp，也不会打开连接池。
+        """
+        if self._http_session is None:
+            import aiohttp
+            connector = aiohttp.TCPConnector(
+                limit=self.settings.max_concurrent_requests,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self._http_session = aiohttp.ClientSession(connector=connector)
+        return self._http_session
+
+    async def run(self, args):
+        """执行命令，并在同一事件循环内释放HTTP连接"""
+        try:
+            return await self.handle_command(args)
+        finally:
+            await self.close()
+
+    async def close(self):
+        """关闭已创建服务持有的HTTP连接（未创建的服务不会被初始化）"""
+        for name in ('update_service', 'github_service'):
+            service = self.__dict__.get(name)
+            if service is not None:
+                await service.close()
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+        if self._llm_http_client is not None:
+            await self._llm_http_client.aclose()
+            self._llm_http_client = None
+
     # === v0.2 新命令处理方法 ===
     async def _handle_progress_report(self, args):
         """处理进展报告命令"""
-        from datetime import datetime, timedelta, timezone
-
         # 计算时间范围
         until = datetime.now(timezone.utc)
         since = until - timedelta(hours=args.hours)
@@ -252,9 +405,11 @@ class GitHubSentinelCLI:
         # 确定模式
         compact_mode = not args.full  # 默认紧凑模式，除非指定--full
 
-        print(f"正在生成 {args.owner}/{args.repo} 的进展报告...")
-        print(f"时间范围: 过去 {args.hours} 小时")
-        print(f"模式: {'完整' if not compact_mode else '紧凑'}模式")
+        self._emit(
+            f"正在生成 {args.owner}/{args.repo} 的进展报告...",
+            f"时间范围: 过去 {args.hours} 小时",
+            f"模式: {'完整' if not compact_mode else '紧凑'}模式"
+        )
 
         progress_file = await self.report_service.generate_daily_progress_report(
             args.owner, args.repo, since=since, until=until, compact_mode=compact_mode
@@ -264,15 +419,15 @@ class GitHubSentinelCLI:
 
     async def _handle_summary_report(self, args):
         """处理摘要报告命令"""
-        from datetime import datetime, timedelta, timezone
-
         # 计算时间范围
         until = datetime.now(timezone.utc)
         since = until - timedelta(hours=args.hours)
 
-        print(f"正在使用LLM生成 {args.owner}/{args.repo} 的摘要报告...")
-        print(f"时间范围: 过去 {args.hours} 小时")
-        print(f"最大token数: {args.max_tokens}")
+        self._emit(
+            f"正在使用LLM生成 {args.owner}/{args.repo} 的摘要报告...",
+            f"时间范围: 过去 {args.hours} 小时",
+            f"最大token数: {args.max_tokens}"
+        )
 
         # 先生成进展报告（使用紧凑模式节省token）
         progress_file = await self.report_service.generate_daily_progress_report(
@@ -293,8 +448,6 @@ class GitHubSentinelCLI:
 
     async def _handle_complete_report(self, args):
         """处理完整报告命令"""
-        from datetime import datetime, timedelta, timezone
-
         # 计算时间范围
         until = datetime.now(timezone.utc)
         since = until - timedelta(hours=args.hours)
@@ -302,10 +455,12 @@ class GitHubSentinelCLI:
         # 确定模式
         compact_mode = not args.full
 
-        print(f"正在生成 {args.owner}/{args.repo} 的完整报告...")
-        print(f"时间范围: 过去 {args.hours} 小时")
-        print(f"模式: {'完整' if not compact_mode else '紧凑'}模式")
-        print(f"最大token数: {args.max_tokens}")
+        self._emit(
+            f"正在生成 {args.owner}/{args.repo} 的完整报告...",
+            f"时间范围: 过去 {args.hours} 小时",
+            f"模式: {'完整' if not compact_mode else '紧凑'}模式",
+            f"最大token数: {args.max_tokens}"
+        )
 
         result = await self.report_service.generate_complete_daily_report(
             args.owner,
@@ -319,12 +474,14 @@ class GitHubSentinelCLI:
             temperature=args.temperature
         )
 
-        print("✅ 完整报告已生成:")
-        print(f"  - 进展报告: {result['progress_report']}")
-        print(f"  - 摘要报告: {result['summary_report']}")
-        print(f"  - 模式: {result['mode']}")
-        print(f"  - 时间范围: {result['time_range']}")
-        print(f"  - 生成时间: {result['generated_at']}")
+        self._emit(
+            "✅ 完整报告已生成:",
+            f"  - 进展报告: {result['progress_report']}",
+            f"  - 摘要报告: {result['summary_report']}",
+            f"  - 模式: {result['mode']}",
+            f"  - 时间范围: {result['time_range']}",
+            f"  - 生成时间: {result['generated_at']}"
+        )
 
     async def _handle_batch_reports(self, args):
         """处理批量报告命令"""
@@ -336,77 +493,127 @@ class GitHubSentinelCLI:
             print(f"读取仓库列表文件失败: {str(e)}")
             return
 
-        print(f"正在批量生成 {len(repos_data)} 个仓库的报告...")
-        print("使用紧凑模式和较小token数量以节省成本...")
+        self._emit(
+            f"正在批量生成 {len(repos_data)} 个仓库的报告...",
+            "使用紧凑模式和较小token数量以节省成本..."
+        )
+
+        if args.use_batch_api:
+            if self.llm_service.supports_batch(args.provider):
+                await self._run_batch_reports_via_api(args, repos_data)
+                return
+            print("⚠️  当前LLM提供商不支持 Batch API，改为逐个调用")
+
+        def show_progress(done: int, total: int, result: dict):
+            if 'error' in result:
+                self._stream(f"  [{done}/{total}] ❌ {result['repository']}: {result['error']}")
+            else:
+                self._stream(f"  [{done}/{total}] ✅ {result['repository']}: 报告已生成")
 
-        results = await self.report_service.batch_generate_reports(
+        # 按 --concurrent 限制并发，完成一个输出一个
+        success_count = 0
+        error_count = 0
+        async for result in self.report_service.iter_batch_reports(
             repos_data,
             args.template,
             args.provider,
+            concurrency=args.concurrent,
+            on_progress=show_progress,
             compact_mode=True,  # 批量处理使用紧凑模式
             max_tokens=1200     # 批量处理使用更小的token数量
-        )
+        ):
+            if 'error' in result:
+                error_count += 1
+            else:
+                success_count += 1
 
-        # 统计结果
-        success_count = sum(1 for r in results if 'error' not in r)
-        error_count = len(results) - success_count
+        self._emit(
+            "✅ 批量报告生成完成:",
+            f"  - 成功: {success_count}",
+            f"  - 失败: {error_count}"
+        )
 
-        print(f"✅ 批量报告生成完成:")
-        print(f"  - 成功: {success_count}")
-        print(f"  - 失败: {error_count}")
+    async def _run_batch_reports_via_api(self, args, repos_data: list):
+        """通过 Batch API 生成批量报告"""
+        print("已提交到 Batch API，等待批处理任务完成...")
+        results = await self.report_service.batch_generate_reports_via_api(
+            repos_data,
+            args.template,
+            args.provider,
+            compact_mode=True,
+            max_tokens=1200
+        )
 
-        # 显示详细结果
+        success_count = sum(1 for r in results if 'error' not in r)
+        lines = [
+            "✅ 批量报告生成完成:",
+            f"  - 成功: {success_count}",
+            f"  - 失败: {len(results) - success_count}"
+        ]
         for result in results:
             if 'error' in result:
-                print(f"  ❌ {result['repository']}: {result['error']}")
+                lines.append(f"  ❌ {result['repository']}: {result['error']}")
             else:
-                print(f"  ✅ {result['repository']}: 报告已生成")
+                lines.append(f"  ✅ {result['repository']}: 报告已生成")
+        self._emit(*lines)
 
     async def _handle_compare_reports(self, args):
         """处理对比报告命令"""
         providers = args.providers or self.llm_service.list_providers()
 
-        print(f"正在对比 {args.owner}/{args.repo} 的报告...")
-        print(f"模板: {args.templates}")
-        print(f"提供商: {providers}")
+        self._emit(
+            f"正在对比 {args.owner}/{args.repo} 的报告...",
+            f"模板: {args.templates}",
+            f"提供商: {providers}"
+        )
+
+        def show_result(result: dict):
+            if 'error' in result:
+                self._stream(f"  ❌ {result['provider']}/{result['template']}: {result['error']}")
+            else:
+                self._stream(f"  ✅ {result['provider']}/{result['template']}: {result['summary_file']}")
 
+        # 模板 × 提供商并发生成，完成一个输出一个
         result = await self.report_service.generate_report_with_multiple_templates(
             args.owner,
             args.repo,
             args.templates,
-            providers[0] if providers else None  # 使用第一个提供商
+            providers,
+            on_result=show_result
         )
 
-        print("✅ 对比报告已生成:")
-        print(f"  - 原始报告: {result['progress_report']}")
-        for template, summary_file in result['summaries'].items():
-            if summary_file.startswith('ERROR:'):
-                print(f"  ❌ {template}: {summary_file}")
-            else:
-                print(f"  ✅ {template}: {summary_file}")
+        success_count = sum(1 for r in result['summaries'] if 'error' not in r)
+        self._emit(
+            "✅ 对比报告已生成:",
+            f"  - 原始报告: {result['progress_report']}",
+            f"  - 成功: {success_count}",
+            f"  - 失败: {len(result['summaries']) - success_count}"
+        )
 
     async def _handle_llm_commands(self, args):
         """处理LLM相关命令"""
         if args.llm_action == 'list':
             providers = self.llm_service.list_providers()
             if providers:
-                print("可用的LLM提供商:")
+                lines = ["可用的LLM提供商:"]
                 for provider_name in providers:
                     info = self.llm_service.get_provider_info(provider_name)
                     default_mark = " (默认)" if info['is_default'] else ""
-                    print(f"  - {provider_name}: {info['model']} ({info['type']}){default_mark}")
+                    lines.append(f"  - {provider_name}: {info['model']} ({info['type']}){default_mark}")
+                self._emit(*lines)
             else:
                 print("没有配置的LLM提供商")
 
         elif args.llm_action == 'test':
             print(f"正在测试LLM提供商: {args.provider}")
             try:
+                # 测试必须真正请求提供商，不能使用缓存的回复
                 response = await self.llm_service.generate_chat(
                     [{"role": "user", "content": args.prompt}],
-                    args.provider
+                    args.provider,
+                    use_cache=False
                 )
-                print(f"✅ 测试成功!")
-                print(f"回复: {response}")
+                self._emit("✅ 测试成功!", f"回复: {response}")
             except Exception as e:
                 print(f"❌ 测试失败: {str(e)}")
 
@@ -415,16 +622,22 @@ class GitHubSentinelCLI:
         history = self.report_service.get_report_history(args.repo, args.limit)
 
         if history:
-            print(f"{args.repo} 的报告历史 (最近 {len(history)} 个):")
-            for i, filepath in enumerate(history, 1):
-                filename = Path(filepath).name
-                print(f"  {i}. {filename}")
+            self._emit(
+                f"{args.repo} 的报告历史 (最近 {len(history)} 个):",
+                *(f"  {i}. {Path(filepath).name}" for i, filepath in enumerate(history, 1))
+            )
         else:
             print(f"没有找到 {args.repo} 的报告历史")
 
     # === v0.1 传统命令处理方法（保持向后兼容）===
     async def _handle_add_subscription(self, args):
         """处理添加订阅命令"""
+        from src.models.subscription import (
+            Subscription, ALL_UPDATE_TYPES,
+            NOTIFICATION_TYPE_MAP, UPDATE_FREQUENCY_MAP, UPDATE_TYPE_MAP
+        )
+        from src.services.subscription_service import AddResult
+
         # 解析仓库URL
         repo_info = self._parse_repo_url(args.repo_url)
         if not repo_info:
@@ -436,13 +649,19 @@ class GitHubSentinelCLI:
             repo_url=args.repo_url,
             owner=repo_info['owner'],
             repo_name=repo_info['repo'],
-            frequency=UpdateFrequency(args.frequency),
-            notification_types=[NotificationType(n) for n in args.notifications],
-            update_types=[UpdateType(t) for t in args.update_types if t != 'all'] or list(UpdateType)
+            # argparse 的 choices 已校验取值，直接查表
+            frequency=UPDATE_FREQUENCY_MAP[args.frequency],
+            notification_types=[NOTIFICATION_TYPE_MAP[n] for n in args.notifications],
+            update_types=[UPDATE_TYPE_MAP[t] for t in args.update_types if t != 'all'] or list(ALL_UPDATE_TYPES)
         )
 
-        await self.subscription_service.add_subscription(subscription)
-        print(f"✅ 已添加订阅: {args.repo_url}")
+        result = await self.subscription_service.add_subscription(subscription)
+        if result is AddResult.ADDED:
+            print(f"✅ 已添加订阅: {args.repo_url}")
+        elif result is AddResult.ALREADY_EXISTS:
+            print(f"⚠️  已存在该仓库的活跃订阅: {args.repo_url}")
+        else:
+            print(f"❌ 添加订阅失败: {args.repo_url}")
 
     async def _handle_list_subscriptions(self, args):
         """处理列出订阅命令"""
@@ -453,17 +672,18 @@ class GitHubSentinelCLI:
             return
 
         if args.format == 'json':
-            import json
-            data = [s.to_dict() for s in subscriptions]
-            print(json.dumps(data, indent=2, ensure_ascii=False, default=str))
+            self._emit_json([s.to_dict() for s in subscriptions])
         else:
-            print(f"共有 {len(subscriptions)} 个订阅:")
+            # 先拼好全部输出再一次性写入，避免每个订阅多次print
+            lines = [f"共有 {len(subscriptions)} 个订阅:"]
             for i, sub in enumerate(subscriptions, 1):
-                print(f"{i}. {sub.repo_url}")
-                print(f"   频率: {sub.frequency.value}")
-                print(f"   通知: {[n.value for n in sub.notification_types]}")
-                print(f"   类型: {[t.value for t in sub.update_types]}")
-                print()
+                lines.append(
+                    f"{i}. {sub.repo_url}\n"
+                    f"   频率: {sub.frequency.value}\n"
+                    f"   通知: {[n.value for n in sub.notification_types]}\n"
+                    f"   类型: {[t.value for t in sub.update_types]}\n"
+                )
+            self._emit(*lines)
 
     async def _handle_remove_subscription(self, args):
         """处理删除订阅命令"""
@@ -472,43 +692,89 @@ class GitHubSentinelCLI:
 
     async def _handle_run_check(self, args):
         """处理手动运行检查命令"""
+        subscriptions = await self.subscription_service.get_active_subscriptions()
+
         if args.repo:
             repo_info = self._parse_repo_url(args.repo)
             if not repo_info:
                 print(f"无效的仓库URL: {args.repo}")
                 return
             # 运行单个仓库检查
+            subscriptions = [
+                sub for sub in subscriptions
+                if sub.owner == repo_info['owner'] and sub.repo_name == repo_info['repo']
+            ]
             print(f"正在检查 {args.repo}...")
         else:
             # 运行所有订阅检查
             print("正在检查所有订阅的仓库...")
 
-        await self.update_service.check_updates()
-        print("✅ 检查完成")
+        if not subscriptions:
+            print("没有需要检查的活跃订阅")
+            return
+
+        # 流式输出：每个仓库返回后立即打印，不必等待全部仓库
+        count = 0
+        async for update in self.update_service.iter_updates(subscriptions):
+            count += 1
+            if count <= 10:
+                self._stream(f"  [{update.update_type}] {update.full_repo}: {update.title}")
+
+        summary = [f"✅ 检查完成，共 {count} 个更新"]
+        if count > 10:
+            summary.insert(0, f"  ... 还有 {count - 10} 个更新")
+        self._emit(*summary)
 
     def _parse_repo_url(self, url: str) -> Optional[dict]:
         """解析GitHub仓库URL"""
-        import re
-        pattern = r'github\.com[/:]([\w\.-]+)/([\w\.-]+?)(?:\.git)?/?$'
-        match = re.search(pattern, url)
+        # 常见的 https://github.com/owner/repo 形式直接切分字符串，无需正则
+        if url.startswith(_GITHUB_PREFIX):
+            path = url[len(_GITHUB_PREFIX):]
+            if path.endswith('/'):
+                path = path[:-1]
+            if path.endswith('.git'):
+                path = path[:-4]
+            parts = path.split('/')
+            if len(parts) == 2 and all(part and _REPO_PART_CHARS.issuperset(part) for part in parts):
+                return {'owner': parts[0], 'repo': parts[1]}
+
+        match = _REPO_RE.search(url)
         if match:
             return {'owner': match.group(1), 'repo': match.group(2)}
         return None
 
 
+def _run_coroutine(coro):
+    """运行协程，安装了uvloop时使用uvloop事件循环"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+
+    uvloop.install()
+    return asyncio.run(coro)
+
+
 def main():
     """主函数"""
     try:
         cli = GitHubSentinelCLI()
-        parser = cli.create_parser()
-        args = parser.parse_args()
+        argv = sys.argv[1:]
+        parser = cli.create_parser(argv)
+        args = parser.parse_args(argv)
 
-        if not args.command:
+        if not hasattr(args, 'func'):
             parser.print_help()
             return 1
 
+        cli.use_cache = not args.no_cache
+
         # 运行异步命令
-        return asyncio.run(cli.handle_command(args))
+        return _run_coroutine(cli.run(args))
     except KeyboardInterrupt:
         print("\n程序被用户中断")
         return 1
@@ -1,18 +1,147 @@
 """
 GitHub Sentinel 配置管理
 """
+import copy
+import hashlib
 import os
-import yaml
-from dataclasses import dataclass, field
+import pickle
+import tempfile
+from functools import lru_cache
+from dataclasses import dataclass, field, fields
 from typing import Optional, Dict, Any, List
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+from .. import __version__
+
+_dotenv_loaded = False
+
+# 进程内的配置解析缓存：路径 -> (mtime_ns, 文件大小, 解析结果)；结果只以深拷贝交给调用方
+_YAML_CACHE: Dict[str, tuple] = {}
+
+
+def _ensure_dotenv():
+    """首次加载配置时读取 .env 文件中的环境变量（只执行一次）"""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
+    _dotenv_loaded = True
+
+
+def _yaml_load(stream) -> Any:
+    """安全解析YAML，优先使用 LibYAML 的C实现"""
+    import yaml
+    return yaml.load(stream, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+# 默认配置文件内容（与按键排序 dump 默认配置字典的结果一致），写入时无需调用YAML序列化
+_DEFAULT_CONFIG_YAML = """\
+database:
+  echo: false
+  path: data/subscriptions.json
+  url: sqlite:///github_sentinel.db
+debug: false
+github:
+  api_url: https://api.github.com
+  rate_limit_per_hour: 5000
+  timeout: 30
+  token: ${GITHUB_TOKEN}
+llm_providers:
+- api_key: ${AZURE_OPENAI_API_KEY}
+  api_version: 2024-02-15-preview
+  azure_endpoint: ${AZURE_OPENAI_ENDPOINT}
+  is_default: true
+  max_tokens: 2000
+  model_name: gpt-4
+  name: azure_openai
+  temperature: 0.7
+  type: azure_openai
+log_file: logs/github_sentinel.log
+log_level: INFO
+notification:
+  email_enabled: false
+  enabled: false
+report:
+  batch_size: 5
+  daily_progress_dir: daily_progress
+  default_template: github_azure_prompt.txt
+  enable_llm_summary: true
+  output_formats:
+  - markdown
+  - json
+  reports_dir: data/reports
+  retry_attempts: 3
+  templates_dir: prompts
+scheduler:
+  daily_report_time: 09:00
+  enabled: true
+  max_workers: 4
+  timezone: UTC
+"""
 
 
-@dataclass
+def _config_cache_file(config_path: Path) -> Path:
+    """配置缓存文件路径（遵循 XDG_CACHE_HOME），每个配置文件对应一个缓存文件"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    digest = hashlib.blake2b(str(config_path).encode('utf-8'), digest_size=16).hexdigest()
+    return Path(cache_home) / "github-sentinel" / f"settings-{digest}.pkl"
+
+
+def _load_config_data(config_path: Path, use_cache: bool = True) -> Dict[str, Any]:
+    """读取YAML配置，按 (路径, mtime, 文件大小, 版本) 缓存解析结果，跨进程复用
+
+    只缓存配置文件本身的内容，环境变量（token、API key等）每次仍实时读取。
+    每次返回缓存结果的深拷贝，调用方修改返回值不会影响缓存。
+    """
+    if not config_path.exists():
+        return {}
+
+    config_path = config_path.resolve()
+    st = config_path.stat()
+
+    # 同一进程内重复加载时直接返回已解析的结果
+    memo = _YAML_CACHE.get(str(config_path))
+    if use_cache and memo is not None and memo[:2] == (st.st_mtime_ns, st.st_size):
+        return copy.deepcopy(memo[2])
+
+    # 与进程内缓存使用相同的 mtime+大小 判断，保留mtime的编辑（cp -p、rsync -t）也能失效
+    key = (str(config_path), st.st_mtime_ns, st.st_size, __version__)
+    cache_file = _config_cache_file(config_path)
+
+    if use_cache:
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_key, cached_data = pickle.load(f)
+            if cached_key == key:
+                _YAML_CACHE[str(config_path)] = (st.st_mtime_ns, st.st_size, cached_data)
+                return copy.deepcopy(cached_data)
+        except Exception:
+            pass  # 缓存不存在或已损坏，重新解析
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_data = _yaml_load(f) or {}
+    _YAML_CACHE[str(config_path)] = (st.st_mtime_ns, st.st_size, config_data)
+
+    if use_cache:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件（mkstemp 权限为0600）再原子替换，并发启动时不会读到半个文件
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((key, config_data), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass  # 缓存写入失败不影响正常加载
+
+    return copy.deepcopy(config_data)
+
+
+@dataclass(slots=True, frozen=True)
 class GitHubConfig:
     """GitHub API 配置"""
     token: str
@@ -21,7 +150,7 @@ class GitHubConfig:
     timeout: int = 30
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LLMProviderConfig:
     """LLM 提供商配置"""
     name: str
@@ -38,7 +167,7 @@ class LLMProviderConfig:
     presence_penalty: float = 0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReportConfig:
     """报告生成配置"""
     daily_progress_dir: str = "daily_progress"
@@ -51,7 +180,7 @@ class ReportConfig:
     retry_attempts: int = 3
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DatabaseConfig:
     """数据库配置"""
     url: str = "sqlite:///github_sentinel.db"
@@ -59,7 +188,7 @@ class DatabaseConfig:
     echo: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SchedulerConfig:
     """调度器配置"""
     enabled: bool = True
@@ -68,7 +197,7 @@ class SchedulerConfig:
     max_workers: int = 4
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NotificationConfig:
     """通知配置"""
     enabled: bool = False
@@ -80,7 +209,51 @@ class NotificationConfig:
     recipients: List[str] = field(default_factory=list)
 
 
-@dataclass
+def _llm_from_env(env: Dict[str, str]) -> List[LLMProviderConfig]:
+    """根据环境变量创建LLM提供商配置（Azure OpenAI 优先作为默认）"""
+    llm_providers = []
+
+    # Azure OpenAI 配置
+    azure_key = env.get("AZURE_OPENAI_API_KEY")
+    if azure_key:
+        llm_providers.append(LLMProviderConfig(
+            name="azure_openai",
+            type="azure_openai",
+            model_name=env.get("AZURE_OPENAI_MODEL", "gpt-4"),
+            api_key=azure_key,
+            azure_endpoint=env.get("AZURE_OPENAI_ENDPOINT"),
+            api_version=env.get("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
+            is_default=True
+        ))
+
+    # OpenAI 配置
+    openai_key = env.get("OPENAI_API_KEY")
+    if openai_key:
+        llm_providers.append(LLMProviderConfig(
+            name="openai",
+            type="openai",
+            model_name=env.get("OPENAI_MODEL", "gpt-4"),
+            api_key=openai_key,
+            is_default=len(llm_providers) == 0  # 如果没有其他提供商则设为默认
+        ))
+
+    return llm_providers
+
+
+# 各配置类可由构造函数接收的字段名，模块导入时计算一次
+_CONFIG_FIELDS = {
+    cls: frozenset(f.name for f in fields(cls) if f.init)
+    for cls in (LLMProviderConfig, NotificationConfig, DatabaseConfig, ReportConfig)
+}
+
+
+def _config_from_dict(cls, data: Dict[str, Any], **defaults):
+    """从配置字典创建配置对象，忽略未知键；未提供的字段使用数据类默认值"""
+    known = _CONFIG_FIELDS[cls]
+    return cls(**{**defaults, **{k: v for k, v in data.items() if k in known}})
+
+
+@dataclass(slots=True, frozen=True)
 class Settings:
     """主配置类"""
     github: GitHubConfig
@@ -94,99 +267,60 @@ class Settings:
     weekly_scan_time: str = "09:00"
     weekly_scan_day: str = "monday"
     max_concurrent_requests: int = 5
+    # 提供商查找表，构造时生成（配置不可变，无需失效）
+    _providers_by_name: Dict[str, LLMProviderConfig] = field(init=False, repr=False, compare=False)
+    _default_provider: Optional[LLMProviderConfig] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 名称重复时保留第一个，与原先的顺序查找一致
+        by_name = {p.name: p for p in reversed(self.llm_providers)}
+        default = next((p for p in self.llm_providers if p.is_default),
+                       self.llm_providers[0] if self.llm_providers else None)
+        object.__setattr__(self, '_providers_by_name', by_name)
+        object.__setattr__(self, '_default_provider', default)
 
     @classmethod
-    def from_config_file(cls, config_path: Optional[str] = None) -> "Settings":
-        """从配置文件创建设置"""
+    def from_config_file(cls, config_path: Optional[str] = None, use_cache: bool = True) -> "Settings":
+        """从配置文件创建设置，环境变量（token、API key、GITHUB_*、LOG_LEVEL）覆盖文件中的值
+
+        use_cache=False 时跳过解析结果的磁盘缓存，直接读取YAML。
+        """
+        _ensure_dotenv()
+        env = os.environ.copy()  # 环境变量快照，整个加载过程读取同一份
+
         # 默认配置文件路径
         if config_path is None:
             config_path = Path(__file__).parent / "config.yaml"
 
-        config_data = {}
-        if Path(config_path).exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_data = yaml.safe_load(f) or {}
+        config_data = _load_config_data(Path(config_path), use_cache)
 
         # 处理GitHub配置 - 优先从环境变量获取token
-        github_config = config_data.get("github", {})
-        github_token = os.getenv("GITHUB_TOKEN") or github_config.get("token")
+        github_config = config_data.get("github") or {}
+        github_token = env.get("GITHUB_TOKEN") or github_config.get("token")
 
         if not github_token or github_token == "null" or github_token is None:
             # 尝试从其他可能的环境变量获取
             github_token = (
-                os.getenv("GH_TOKEN") or
-                os.getenv("GITHUB_ACCESS_TOKEN") or
+                env.get("GH_TOKEN") or
+                env.get("GITHUB_ACCESS_TOKEN") or
                 ""
             )
 
+        # 环境变量优先于配置文件
         github = GitHubConfig(
             token=github_token,
-            api_url=github_config.get("api_url", "https://api.github.com"),
-            rate_limit_per_hour=github_config.get("rate_limit_per_hour", 5000),
-            timeout=github_config.get("timeout", 30)
-        )
-
-        # LLM 提供商配置
-        llm_providers = []
-
-        # Azure OpenAI 配置
-        if os.getenv("AZURE_OPENAI_API_KEY"):
-            azure_provider = LLMProviderConfig(
-                name="azure_openai",
-                type="azure_openai",
-                model_name=os.getenv("AZURE_OPENAI_MODEL", "gpt-4"),
-                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
-                is_default=True
-            )
-            llm_providers.append(azure_provider)
-
-        # OpenAI 配置
-        if os.getenv("OPENAI_API_KEY"):
-            openai_provider = LLMProviderConfig(
-                name="openai",
-                type="openai",
-                model_name=os.getenv("OPENAI_MODEL", "gpt-4"),
-                api_key=os.getenv("OPENAI_API_KEY"),
-                is_default=len(llm_providers) == 0  # 如果没有其他提供商则设为默认
-            )
-            llm_providers.append(openai_provider)
-
-        notification = NotificationConfig(
-            enabled=config_data.get("notification", {}).get("enabled", False),
-            email_enabled=config_data.get("notification", {}).get("email_enabled", False),
-            smtp_server=config_data.get("notification", {}).get("smtp_server", ""),
-            smtp_port=config_data.get("notification", {}).get("smtp_port", 587),
-            smtp_username=config_data.get("notification", {}).get("smtp_username", ""),
-            smtp_password=config_data.get("notification", {}).get("smtp_password", ""),
-            recipients=config_data.get("notification", {}).get("recipients", [])
-        )
-
-        database = DatabaseConfig(
-            url=config_data.get("database", {}).get("url", "sqlite:///github_sentinel.db"),
-            path=config_data.get("database", {}).get("path", "data/subscriptions.json"),  # 添加path属性用于JSON文件存储
-            echo=config_data.get("database", {}).get("echo", False)
-        )
-
-        report = ReportConfig(
-            daily_progress_dir=config_data.get("report", {}).get("daily_progress_dir", "daily_progress"),
-            reports_dir=config_data.get("report", {}).get("reports_dir", "data/reports"),
-            default_template=config_data.get("report", {}).get("default_template", "github_azure_prompt.txt"),
-            templates_dir=config_data.get("report", {}).get("templates_dir", "prompts"),
-            output_formats=config_data.get("report", {}).get("output_formats", ["markdown", "json"]),
-            enable_llm_summary=config_data.get("report", {}).get("enable_llm_summary", True),
-            batch_size=config_data.get("report", {}).get("batch_size", 5),
-            retry_attempts=config_data.get("report", {}).get("retry_attempts", 3)
+            api_url=env.get("GITHUB_API_URL") or github_config.get("api_url", "https://api.github.com"),
+            rate_limit_per_hour=int(env.get("GITHUB_RATE_LIMIT") or github_config.get("rate_limit_per_hour", 5000)),
+            timeout=int(env.get("GITHUB_TIMEOUT") or github_config.get("timeout", 30))
         )
 
         return cls(
             github=github,
-            llm_providers=llm_providers,
-            notification=notification,
-            database=database,
-            report=report,
-            log_level=config_data.get("log_level", "INFO"),
+            llm_providers=_llm_from_env(env),
+            notification=_config_from_dict(NotificationConfig, config_data.get("notification") or {}),
+            database=_config_from_dict(DatabaseConfig, config_data.get("database") or {}),
+            report=_config_from_dict(ReportConfig, config_data.get("report") or {}),
+            log_level=env.get("LOG_LEVEL") or config_data.get("log_level", "INFO"),
             log_file=config_data.get("log_file", "logs/github_sentinel.log"),
             daily_scan_time=config_data.get("daily_scan_time", "09:00"),
             weekly_scan_time=config_data.get("weekly_scan_time", "09:00"),
@@ -197,52 +331,26 @@ class Settings:
     @classmethod
     def from_env(cls) -> "Settings":
         """从环境变量加载设置"""
+        _ensure_dotenv()
+        env = os.environ.copy()  # 环境变量快照，整个加载过程读取同一份
         github_config = GitHubConfig(
-            token=os.getenv("GITHUB_TOKEN", ""),
-            api_url=os.getenv("GITHUB_API_URL", "https://api.github.com"),
-            rate_limit_per_hour=int(os.getenv("GITHUB_RATE_LIMIT", "5000")),
-            timeout=int(os.getenv("GITHUB_TIMEOUT", "30"))
+            token=env.get("GITHUB_TOKEN", ""),
+            api_url=env.get("GITHUB_API_URL", "https://api.github.com"),
+            rate_limit_per_hour=int(env.get("GITHUB_RATE_LIMIT", "5000")),
+            timeout=int(env.get("GITHUB_TIMEOUT", "30"))
         )
 
-        # LLM 提供商配置
-        llm_providers = []
-
-        # Azure OpenAI 配置
-        if os.getenv("AZURE_OPENAI_API_KEY"):
-            azure_provider = LLMProviderConfig(
-                name="azure_openai",
-                type="azure_openai",
-                model_name=os.getenv("AZURE_OPENAI_MODEL", "gpt-4"),
-                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
-                is_default=True
-            )
-            llm_providers.append(azure_provider)
-
-        # OpenAI 配置
-        if os.getenv("OPENAI_API_KEY"):
-            openai_provider = LLMProviderConfig(
-                name="openai",
-                type="openai",
-                model_name=os.getenv("OPENAI_MODEL", "gpt-4"),
-                api_key=os.getenv("OPENAI_API_KEY"),
-                is_default=len(llm_providers) == 0  # 如果没有其他提供商则设为默认
-            )
-            llm_providers.append(openai_provider)
-
         return cls(
             github=github_config,
-            llm_providers=llm_providers,
-            debug=os.getenv("DEBUG", "false").lower() == "true",
-            log_level=os.getenv("LOG_LEVEL", "INFO"),
+            llm_providers=_llm_from_env(env),
+            log_level=env.get("LOG_LEVEL", "INFO"),
         )
 
     @classmethod
     def _from_dict(cls, data: Dict[str, Any]) -> "Settings":
         """从字典创建设置对象"""
         # GitHub 配置
-        github_data = data.get("github", {})
+        github_data = data.get("github") or {}
         github_config = GitHubConfig(
             token=github_data.get("token", os.getenv("GITHUB_TOKEN", "")),
             api_url=github_data.get("api_url", "https://api.github.com"),
@@ -250,52 +358,18 @@ class Settings:
             timeout=github_data.get("timeout", 30)
         )
 
-        # LLM 提供商配置
-        llm_providers = []
-        for provider_data in data.get("llm_providers", []):
-            provider = LLMProviderConfig(
-                name=provider_data["name"],
-                type=provider_data["type"],
-                model_name=provider_data["model_name"],
-                api_key=provider_data.get("api_key", ""),
-                azure_endpoint=provider_data.get("azure_endpoint"),
-                api_version=provider_data.get("api_version", "2024-02-15-preview"),
-                is_default=provider_data.get("is_default", False),
-                max_tokens=provider_data.get("max_tokens", 2000),
-                temperature=provider_data.get("temperature", 0.7),
-                top_p=provider_data.get("top_p", 1.0),
-                frequency_penalty=provider_data.get("frequency_penalty", 0),
-                presence_penalty=provider_data.get("presence_penalty", 0)
-            )
-            llm_providers.append(provider)
-
-        # 报告配置
-        report_data = data.get("report", {})
-        report_config = ReportConfig(
-            daily_progress_dir=report_data.get("daily_progress_dir", "daily_progress"),
-            reports_dir=report_data.get("reports_dir", "data/reports"),
-            default_template=report_data.get("default_template", "github_azure_prompt.txt"),
-            templates_dir=report_data.get("templates_dir", "prompts"),
-            output_formats=report_data.get("output_formats", ["markdown", "json"]),
-            enable_llm_summary=report_data.get("enable_llm_summary", True),
-            batch_size=report_data.get("batch_size", 5),
-            retry_attempts=report_data.get("retry_attempts", 3)
-        )
-
-        # 其他配置...
-        database_data = data.get("database", {})
-        database_config = DatabaseConfig(
-            url=database_data.get("url", "sqlite:///github_sentinel.db"),
-            path=database_data.get("path", "data/subscriptions.json"),  # 添加path属性用于JSON文件存储
-            echo=database_data.get("echo", False)
-        )
+        # LLM 提供商配置（api_key 可省略）
+        llm_providers = [
+            _config_from_dict(LLMProviderConfig, provider_data, api_key="")
+            for provider_data in data.get("llm_providers") or []
+        ]
 
         return cls(
             github=github_config,
             llm_providers=llm_providers,
-            report=report_config,
-            database=database_config,
-            debug=data.get("debug", False),
+            notification=_config_from_dict(NotificationConfig, data.get("notification") or {}),
+            report=_config_from_dict(ReportConfig, data.get("report") or {}),
+            database=_config_from_dict(DatabaseConfig, data.get("database") or {}),
             log_level=data.get("log_level", "INFO"),
             log_file=data.get("log_file", "logs/github_sentinel.log")
         )
@@ -304,70 +378,21 @@ class Settings:
     def _create_default_config(cls, config_path: Path):
         """创建默认配置文件"""
         config_path.parent.mkdir(parents=True, exist_ok=True)
-
-        default_config = {
-            "github": {
-                "token": "${GITHUB_TOKEN}",
-                "api_url": "https://api.github.com",
-                "rate_limit_per_hour": 5000,
-                "timeout": 30
-            },
-            "llm_providers": [
-                {
-                    "name": "azure_openai",
-                    "type": "azure_openai",
-                    "model_name": "gpt-4",
-                    "api_key": "${AZURE_OPENAI_API_KEY}",
-                    "azure_endpoint": "${AZURE_OPENAI_ENDPOINT}",
-                    "api_version": "2024-02-15-preview",
-                    "is_default": True,
-                    "max_tokens": 2000,
-                    "temperature": 0.7
-                }
-            ],
-            "report": {
-                "daily_progress_dir": "daily_progress",
-                "reports_dir": "data/reports",
-                "default_template": "github_azure_prompt.txt",
-                "templates_dir": "prompts",
-                "output_formats": ["markdown", "json"],
-                "enable_llm_summary": True,
-                "batch_size": 5,
-                "retry_attempts": 3
-            },
-            "database": {
-                "url": "sqlite:///github_sentinel.db",
-                "path": "data/subscriptions.json",  # 添加path属性用于JSON文件存储
-                "echo": False
-            },
-            "scheduler": {
-                "enabled": True,
-                "daily_report_time": "09:00",
-                "timezone": "UTC",
-                "max_workers": 4
-            },
-            "notification": {
-                "enabled": False,
-                "email_enabled": False
-            },
-            "debug": False,
-            "log_level": "INFO",
-            "log_file": "logs/github_sentinel.log"
-        }
-
-        with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(default_config, f, default_flow_style=False, allow_unicode=True, indent=2)
+        config_path.write_text(_DEFAULT_CONFIG_YAML, encoding='utf-8')
 
     def get_default_llm_provider(self) -> Optional[LLMProviderConfig]:
         """获取默认LLM提供商配置"""
-        for provider in self.llm_providers:
-            if provider.is_default:
-                return provider
-        return self.llm_providers[0] if self.llm_providers else None
+        return self._default_provider
 
     def get_llm_provider(self, name: str) -> Optional[LLMProviderConfig]:
         """根据名称获取LLM提供商配置"""
-        for provider in self.llm_providers:
-            if provider.name == name:
-                return provider
-        return None
+        return self._providers_by_name.get(name)
+
+
+@lru_cache(maxsize=8)
+def get_settings(config_path: Optional[str] = None) -> Settings:
+    """获取配置（同一配置路径在进程内只加载一次）
+
+    Settings 是不可变对象，可以安全地在各服务之间共享。
+    """
+    return Settings.from_config_file(config_path)
@@ -4,28 +4,45 @@ GitHub Sentinel 主入口文件
 import asyncio
 import signal
 import sys
+import threading
+from functools import cached_property
 from pathlib import Path
 
-# 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# 直接以脚本方式运行时（python src/main.py）才需要把项目根目录加入Python路径；
+# 通过安装的入口或 python -m 运行时包已可导入
+if __name__ == "__main__" and __package__ is None:
+    project_root = Path(__file__).parent.parent
+    sys.path.insert(0, str(project_root))
 
-from src.config.settings import Settings
 from src.services.subscription_service import SubscriptionService
 from src.services.update_service import UpdateService
 from src.services.notification_service import NotificationService
-from src.services.llm_service import LLMService
-from src.services.report_service import ReportService
 from src.services.github_service import GitHubService
-from src.services.web_service import WebService
 from src.utils.scheduler import TaskScheduler
 from src.utils.logger import setup_logger
+from src.models.subscription import UpdateFrequency
+
+# 参与每日/每周扫描的订阅频率
+_DAILY_FREQS = frozenset({UpdateFrequency.DAILY, UpdateFrequency.BOTH})
+_WEEKLY_FREQS = frozenset({UpdateFrequency.WEEKLY, UpdateFrequency.BOTH})
+
+
+def _select_subscriptions(subscriptions, frequencies):
+    """一次遍历筛选出指定频率的订阅及其ID"""
+    selected, ids = [], []
+    for sub in subscriptions:
+        if sub.frequency in frequencies:
+            selected.append(sub)
+            ids.append(sub.id)
+    return selected, ids
 
 
 class GitHubSentinel:
     def __init__(self, config_path: str = None):
         """初始化GitHub Sentinel"""
-        self.settings = Settings.from_config_file(config_path)
+        # 配置模块在首次加载时才读取 .env 和YAML，--help 不会触发
+        from src.config.settings import get_settings
+        self.settings = get_settings(config_path)
         # 使用新的日志配置，传递日志文件路径
         self.logger = setup_logger(
             self.settings.log_level,
@@ -43,9 +60,7 @@ class GitHubSentinel:
         self.subscription_service = SubscriptionService(self.settings)
 
         # 修复GitHubService初始化 - 更好的token获取和验证
-        github_token = ""
-        if hasattr(self.settings, 'github') and hasattr(self.settings.github, 'token'):
-            github_token = self.settings.github.token or ""
+        github_token = self.settings.github.token or ""
 
         # 验证token是否有效
         if not github_token or github_token == "null" or github_token.strip() == "":
@@ -60,15 +75,34 @@ class GitHubSentinel:
         self.github_service = GitHubService(github_token)
         self.update_service = UpdateService(self.settings)
         self.notification_service = NotificationService(self.settings)
-        # 修复ReportService初始化
-        self.llm_service = LLMService()
-        self.report_service = ReportService(self.llm_service, self.github_service)
-        self.web_service = WebService(self.settings)
         self.scheduler = TaskScheduler()
-
-        # 设置信号处理
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # stop() 时置位，主线程阻塞等待而不是定时轮询
+        self._stop_event = threading.Event()
+
+    # LLM、报告和Web界面服务在首次使用时才导入和创建（openai、gradio 等依赖较重）
+    @cached_property
+    def llm_service(self):
+        """LLM 服务"""
+        from src.services.llm_service import LLMService
+        return LLMService()
+
+    @cached_property
+    def report_service(self):
+        """报告生成服务"""
+        from src.services.report_service import ReportService
+        return ReportService(self.llm_service, self.github_service)
+
+    @cached_property
+    def web_service(self):
+        """Web界面服务"""
+        from src.services.web_service import WebService
+        return WebService(self.settings)
+
+    def _install_signal_handlers(self):
+        """设置信号处理（只在真正启动时设置，且只能在主线程中设置）"""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
 
     def _signal_handler(self, signum, frame):
         """处理系统信号"""
@@ -76,6 +110,11 @@ class GitHubSentinel:
         self.stop()
         sys.exit(0)
 
+    async def close(self):
+        """释放已创建服务持有的HTTP连接（须在发起请求的事件循环内调用）"""
+        await self.github_service.close()
+        await self.update_service.close()
+
     async def run_daily_scan(self):
         """执行每日扫描任务"""
         try:
@@ -87,7 +126,7 @@ class GitHubSentinel:
                 return
 
             # 获取每日更新的订阅
-            daily_subs = [s for s in subscriptions if s.frequency.value in ['daily', 'both']]
+            daily_subs, daily_ids = _select_subscriptions(subscriptions, _DAILY_FREQS)
             if not daily_subs:
                 self.logger.info("没有每日扫描的订阅")
                 return
@@ -98,8 +137,7 @@ class GitHubSentinel:
                 await self.notification_service.send_notifications(report, daily_subs)
 
                 # 更新最后检查时间
-                sub_ids = [s.id for s in daily_subs]
-                await self.subscription_service.update_last_checked(sub_ids)
+                await self.subscription_service.update_last_checked(daily_ids)
 
                 self.logger.info(f"每日扫描完成，处理了 {len(updates)} 个更新")
             else:
@@ -115,7 +153,7 @@ class GitHubSentinel:
             subscriptions = await self.subscription_service.get_active_subscriptions()
 
             # 获取每周更新的订阅
-            weekly_subs = [s for s in subscriptions if s.frequency.value in ['weekly', 'both']]
+            weekly_subs, weekly_ids = _select_subscriptions(subscriptions, _WEEKLY_FREQS)
             if not weekly_subs:
                 self.logger.info("没有每周扫描的订阅")
                 return
@@ -127,8 +165,7 @@ class GitHubSentinel:
                 await self.notification_service.send_notifications(report, weekly_subs)
 
                 # 更新最后检查时间
-                sub_ids = [s.id for s in weekly_subs]
-                await self.subscription_service.update_last_checked(sub_ids)
+                await self.subscription_service.update_last_checked(weekly_ids)
 
                 self.logger.info(f"每周扫描完成，处理了 {len(updates)} 个更新")
             else:
@@ -139,32 +176,28 @@ class GitHubSentinel:
 
     def start(self):
         """启动应用"""
+        self._install_signal_handlers()
         self.logger.info("GitHub Sentinel 启动中...")
 
         try:
-            # 调度任务 - 使用默认时间配置
-            daily_time = getattr(self.settings, 'daily_scan_time', "09:00")
-            weekly_day = getattr(self.settings, 'weekly_scan_day', "monday")
-            weekly_time = getattr(self.settings, 'weekly_scan_time', "10:00")
-
+            # 调度任务 - 时间取自配置（字段自带默认值）
             self.scheduler.schedule_daily_task(
                 self.run_daily_scan,
-                time=daily_time
+                time=self.settings.daily_scan_time
             )
             self.scheduler.schedule_weekly_task(
                 self.run_weekly_scan,
-                day=weekly_day,
-                time=weekly_time
+                day=self.settings.weekly_scan_day,
+                time=self.settings.weekly_scan_time
             )
 
             # 启动调度器
             self.scheduler.start()
             self.logger.info("GitHub Sentinel 已启动，按 Ctrl+C 停止")
 
-            # 保持主线程运行
+            # 保持主线程运行，直到 stop() 被调用
             try:
-                while self.scheduler.is_running:
-                    asyncio.get_event_loop().run_until_complete(asyncio.sleep(60))
+                self._stop_event.wait()
             except KeyboardInterrupt:
                 self.stop()
 
@@ -177,10 +210,18 @@ class GitHubSentinel:
         self.logger.info("正在停止 GitHub Sentinel...")
         if hasattr(self, 'scheduler'):
             self.scheduler.stop()
+        if hasattr(self, 'update_service'):
+            try:
+                asyncio.run(self.close())
+            except Exception as e:
+                self.logger.warning(f"释放HTTP连接失败: {e}")
+        if hasattr(self, '_stop_event'):
+            self._stop_event.set()
         self.logger.info("GitHub Sentinel 已停止")
 
     def start_web(self, server_name: str = "0.0.0.0", server_port: int = 7860, share: bool = False):
         """启动Web界面"""
+        self._install_signal_handlers()
         self.logger.info("启动GitHub Sentinel Web界面...")
         try:
             self.web_service.launch(server_name=server_name, server_port=server_port, share=share)
@@ -1,12 +1,12 @@
 """数据模型模块"""
 from .subscription import Subscription, NotificationType, UpdateFrequency, UpdateType
-from .repository import Repository, RepositoryUpdate
+from .repository import Repository, RepositoryUpdate, IssueRow, PullRequestRow
 from .notification import NotificationPayload
 from .report import Report
 
 __all__ = [
     'Subscription', 'NotificationType', 'UpdateFrequency', 'UpdateType',
-    'Repository', 'RepositoryUpdate',
+    'Repository', 'RepositoryUpdate', 'IssueRow', 'PullRequestRow',
     'NotificationPayload',
     'Report'
 ]
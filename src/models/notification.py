@@ -6,35 +6,37 @@ from typing import Dict, Any, List, Optional
 from enum import Enum
 
 
-class NotificationChannel(Enum):
-    """通知渠道枚举"""
+class NotificationChannel(str, Enum):
+    """通知渠道枚举（str 子类，成员本身即可作为字符串序列化）"""
     EMAIL = "email"
     SLACK = "slack"
     DISCORD = "discord"
     WEBHOOK = "webhook"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NotificationPayload:
     """通知载荷"""
     channel: NotificationChannel
     subject: str
     body: str
-    metadata: Dict[str, Any]
+    # 没有附加信息时为 None，省去每个载荷一次空字典分配
+    metadata: Optional[Dict[str, Any]] = None
     recipients: Optional[List[str]] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
+        """转换为字典（每次返回新字典；metadata、recipients 与载荷共用同一对象）"""
         return {
             'channel': self.channel.value,
             'subject': self.subject,
             'body': self.body,
-            'metadata': self.metadata,
+            'metadata': self.metadata if self.metadata is not None else {},
             'recipients': self.recipients
         }
 
     @classmethod
-    def create_email(cls, subject: str, body: str, recipients: List[str], **metadata) -> 'NotificationPayload':
+    def create_email(cls, subject: str, body: str, recipients: List[str],
+                     metadata: Optional[Dict[str, Any]] = None) -> 'NotificationPayload':
         """创建邮件通知"""
         return cls(
             channel=NotificationChannel.EMAIL,
@@ -45,7 +47,8 @@ class NotificationPayload:
         )
 
     @classmethod
-    def create_slack(cls, subject: str, body: str, **metadata) -> 'NotificationPayload':
+    def create_slack(cls, subject: str, body: str,
+                     metadata: Optional[Dict[str, Any]] = None) -> 'NotificationPayload':
         """创建Slack通知"""
         return cls(
             channel=NotificationChannel.SLACK,
@@ -55,7 +58,8 @@ class NotificationPayload:
         )
 
     @classmethod
-    def create_discord(cls, subject: str, body: str, **metadata) -> 'NotificationPayload':
+    def create_discord(cls, subject: str, body: str,
+                       metadata: Optional[Dict[str, Any]] = None) -> 'NotificationPayload':
         """创建Discord通知"""
         return cls(
             channel=NotificationChannel.DISCORD,
@@ -65,12 +69,14 @@ class NotificationPayload:
         )
 
     @classmethod
-    def create_webhook(cls, subject: str, body: str, webhook_url: str, **metadata) -> 'NotificationPayload':
-        """创建Webhook通知"""
-        metadata['webhook_url'] = webhook_url
+    def create_webhook(cls, subject: str, body: str, webhook_url: str,
+                       metadata: Optional[Dict[str, Any]] = None) -> 'NotificationPayload':
+        """创建Webhook通知（不修改调用方传入的 metadata）"""
+        webhook_metadata = dict(metadata) if metadata else {}
+        webhook_metadata['webhook_url'] = webhook_url
         return cls(
             channel=NotificationChannel.WEBHOOK,
             subject=subject,
             body=body,
-            metadata=metadata
+            metadata=webhook_metadata
         )
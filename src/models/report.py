@@ -1,19 +1,69 @@
 """
 报告数据模型
 """
+import heapq
+import json
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from itertools import groupby
+from operator import attrgetter, itemgetter
+from typing import List, Dict, Any, Iterator, Optional
 from .repository import RepositoryUpdate
 
 
-@dataclass
+# HTML报告各段模板
+_HTML_HEADER = """<h2>📊 {report_type} 报告</h2>
+<p><em>生成时间: {generated_at}</em></p>
+<h3>📈 摘要</h3>
+<ul>
+<li>总更新数: <strong>{total_updates}</strong></li>
+<li>涉及仓库: <strong>{repositories_count}</strong></li>
+</ul>"""
+_HTML_TYPE_ITEM = "<li>{icon} {update_type}: <strong>{count}</strong></li>"
+_HTML_CONTRIBUTOR_ITEM = "<li>{author}: <strong>{count}</strong> 次贡献</li>"
+# 单条更新使用 % 格式化模板，每条记录只做一次格式化
+_HTML_UPDATE_FMT = (
+    "<li>%s <a href='%s' target='_blank'>%s</a><br>"
+    "<small>👤 %s • 🕒 %s</small></li>"
+)
+_TEXT_UPDATE_FMT = "  %s %s%s\n     👤 %s • 🕒 %s"
+_UPDATE_TIME_FMT = '%m-%d %H:%M'
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson 无法直接编码的对象：更新记录使用 to_dict()，其余转为字符串"""
+    if isinstance(obj, RepositoryUpdate):
+        return obj.to_dict()
+    return str(obj)
+
+
+@dataclass(slots=True)
 class Report:
     """报告模型"""
     report_type: str  # daily, weekly, custom
     generated_at: datetime = field(default_factory=datetime.now)
     updates: List[RepositoryUpdate] = field(default_factory=list)
     summary: Optional[Dict[str, Any]] = None
+    # 分组结果和渲染输出的缓存，updates 变化时须通过 add_update 失效
+    _grouped: Optional[Dict[str, List[RepositoryUpdate]]] = field(default=None, init=False, repr=False, compare=False)
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _html: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    # 更新类型图标（类常量，非数据类字段）
+    _ICONS = {
+        'commits': '💾',
+        'issues': '🐛',
+        'pull_requests': '🔄',
+        'releases': '🚀'
+    }
+    _DEFAULT_ICON = '📌'
+
+    def add_update(self, update: RepositoryUpdate):
+        """添加一条更新并清除已缓存的摘要和渲染结果"""
+        self.updates.append(update)
+        self.summary = None
+        self._grouped = self._text = self._html = None
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -24,6 +74,27 @@ class Report:
             'summary': self.summary
         }
 
+    def to_json_bytes(self, indent: bool = False) -> bytes:
+        """序列化为UTF-8 JSON字节
+
+        安装了 orjson 时用其直接编码，输出的字段和时间格式与 to_dict() 一致。
+        """
+        try:
+            import orjson
+        except ImportError:
+            return json.dumps(
+                self.to_dict(), ensure_ascii=False, indent=2 if indent else None, default=str
+            ).encode('utf-8')
+
+        # 更新记录不按数据类字段直接序列化（会带出内部的 full_repo），交给 default 走 to_dict()
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps({
+            'report_type': self.report_type,
+            'generated_at': self.generated_at,
+            'updates': self.updates,
+            'summary': self.summary
+        }, default=_json_default, option=option)
+
     def generate_summary(self) -> Dict[str, Any]:
         """生成报告摘要"""
         if not self.updates:
@@ -34,29 +105,18 @@ class Report:
                 'top_contributors': []
             }
 
-        # 统计更新类型
-        update_types = {}
-        repositories = set()
-        contributors = {}
-
-        for update in self.updates:
-            # 统计更新类型
-            update_type = update.update_type
-            update_types[update_type] = update_types.get(update_type, 0) + 1
-
-            # 统计仓库
-            repositories.add(f"{update.owner}/{update.repo_name}")
+        # 统计更新类型、仓库和贡献者
+        update_types = Counter(update.update_type for update in self.updates)
+        repositories = {update.full_repo for update in self.updates}
+        contributors = Counter(update.author for update in self.updates)
 
-            # 统计贡献者
-            contributors[update.author] = contributors.get(update.author, 0) + 1
-
-        # 排序贡献者
-        top_contributors = sorted(contributors.items(), key=lambda x: x[1], reverse=True)[:5]
+        # 只需前5名贡献者，无需完整排序
+        top_contributors = heapq.nlargest(5, contributors.items(), key=itemgetter(1))
 
         summary = {
             'total_updates': len(self.updates),
             'repositories_count': len(repositories),
-            'update_types': update_types,
+            'update_types': dict(update_types),
             'top_contributors': [{'author': author, 'count': count} for author, count in top_contributors],
             'repositories': list(repositories)
         }
@@ -66,50 +126,60 @@ class Report:
 
     def to_text(self) -> str:
         """转换为文本格式"""
+        if self._text is None:
+            self._text = self._render_text()
+        return self._text
+
+    def _render_text(self) -> str:
+        """渲染文本格式"""
         if not self.updates:
             return f"📊 {self.report_type.upper()} 报告 - {self.generated_at.strftime('%Y-%m-%d %H:%M')}\n\n暂无更新"
+        return "\n".join(self._iter_text_lines())
 
+    def _iter_text_lines(self) -> Iterator[str]:
+        """逐行产出文本报告"""
         summary = self.summary or self.generate_summary()
 
-        lines = [
-            f"📊 {self.report_type.upper()} 报告 - {self.generated_at.strftime('%Y-%m-%d %H:%M')}",
-            "",
-            "📈 摘要:",
-            f"  • 总更新数: {summary['total_updates']}",
-            f"  • 涉及仓库: {summary['repositories_count']}",
-            ""
-        ]
+        yield f"📊 {self.report_type.upper()} 报告 - {self.generated_at.strftime('%Y-%m-%d %H:%M')}"
+        yield ""
+        yield "📈 摘要:"
+        yield f"  • 总更新数: {summary['total_updates']}"
+        yield f"  • 涉及仓库: {summary['repositories_count']}"
+        yield ""
 
         # 更新类型统计
         if summary['update_types']:
-            lines.append("📋 更新类型分布:")
+            yield "📋 更新类型分布:"
             for update_type, count in summary['update_types'].items():
-                icon = self._get_update_type_icon(update_type)
-                lines.append(f"  {icon} {update_type}: {count}")
-            lines.append("")
+                yield f"  {self._ICONS.get(update_type, self._DEFAULT_ICON)} {update_type}: {count}"
+            yield ""
 
         # 活跃贡献者
         if summary['top_contributors']:
-            lines.append("👥 活跃贡献者:")
+            yield "👥 活跃贡献者:"
             for contributor in summary['top_contributors']:
-                lines.append(f"  • {contributor['author']}: {contributor['count']} 次贡献")
-            lines.append("")
+                yield f"  • {contributor['author']}: {contributor['count']} 次贡献"
+            yield ""
 
         # 详细更新列表
-        lines.append("📝 详细更新:")
-        grouped_updates = self._group_updates_by_repo()
-
-        for repo, updates in grouped_updates.items():
-            lines.append(f"\n🔗 {repo}")
+        yield "📝 详细更新:"
+        for repo, updates in self._group_updates_by_repo().items():
+            yield f"\n🔗 {repo}"
             for update in updates:
-                icon = self._get_update_type_icon(update.update_type)
-                lines.append(f"  {icon} {update.title[:80]}{'...' if len(update.title) > 80 else ''}")
-                lines.append(f"     👤 {update.author} • 🕒 {update.created_at.strftime('%m-%d %H:%M')}")
-
-        return "\n".join(lines)
+                yield _TEXT_UPDATE_FMT % (
+                    self._ICONS.get(update.update_type, self._DEFAULT_ICON),
+                    update.title[:80], '...' if len(update.title) > 80 else '',
+                    update.author, update.created_at.strftime(_UPDATE_TIME_FMT)
+                )
 
     def to_html(self) -> str:
         """转换为HTML格式"""
+        if self._html is None:
+            self._html = self._render_html()
+        return self._html
+
+    def _render_html(self) -> str:
+        """渲染HTML格式"""
         if not self.updates:
             return f"""
             <h2>📊 {self.report_type.upper()} 报告</h2>
@@ -117,80 +187,65 @@ class Report:
             <p>暂无更新</p>
             """
 
-        summary = self.summary or self.generate_summary()
+        return "\n".join(self._iter_html_parts())
 
-        html_parts = [
-            f"<h2>📊 {self.report_type.upper()} 报告</h2>",
-            f"<p><em>生成时间: {self.generated_at.strftime('%Y-%m-%d %H:%M')}</em></p>",
+    def _iter_html_parts(self) -> Iterator[str]:
+        """逐段产出HTML报告"""
+        summary = self.summary or self.generate_summary()
 
-            "<h3>📈 摘要</h3>",
-            "<ul>",
-            f"<li>总更新数: <strong>{summary['total_updates']}</strong></li>",
-            f"<li>涉及仓库: <strong>{summary['repositories_count']}</strong></li>",
-            "</ul>"
-        ]
+        yield _HTML_HEADER.format_map({
+            'report_type': self.report_type.upper(),
+            'generated_at': self.generated_at.strftime('%Y-%m-%d %H:%M'),
+            'total_updates': summary['total_updates'],
+            'repositories_count': summary['repositories_count'],
+        })
 
         # 更新类型统计
         if summary['update_types']:
-            html_parts.extend([
-                "<h3>📋 更新类型分布</h3>",
-                "<ul>"
-            ])
+            yield "<h3>📋 更新类型分布</h3>\n<ul>"
             for update_type, count in summary['update_types'].items():
-                icon = self._get_update_type_icon(update_type)
-                html_parts.append(f"<li>{icon} {update_type}: <strong>{count}</strong></li>")
-            html_parts.append("</ul>")
+                yield _HTML_TYPE_ITEM.format_map({
+                    'icon': self._ICONS.get(update_type, self._DEFAULT_ICON),
+                    'update_type': update_type,
+                    'count': count,
+                })
+            yield "</ul>"
 
         # 活跃贡献者
         if summary['top_contributors']:
-            html_parts.extend([
-                "<h3>👥 活跃贡献者</h3>",
-                "<ul>"
-            ])
+            yield "<h3>👥 活跃贡献者</h3>\n<ul>"
             for contributor in summary['top_contributors']:
-                html_parts.append(f"<li>{contributor['author']}: <strong>{contributor['count']}</strong> 次贡献</li>")
-            html_parts.append("</ul>")
+                yield _HTML_CONTRIBUTOR_ITEM.format_map(contributor)
+            yield "</ul>"
 
         # 详细更新列表
-        html_parts.append("<h3>📝 详细更新</h3>")
-        grouped_updates = self._group_updates_by_repo()
-
-        for repo, updates in grouped_updates.items():
-            html_parts.extend([
-                f"<h4>🔗 {repo}</h4>",
-                "<ul>"
-            ])
+        yield "<h3>📝 详细更新</h3>"
+        for repo, updates in self._group_updates_by_repo().items():
+            yield f"<h4>🔗 {repo}</h4>\n<ul>"
             for update in updates:
-                icon = self._get_update_type_icon(update.update_type)
-                html_parts.append(
-                    f"<li>{icon} <a href='{update.url}' target='_blank'>{update.title}</a><br>"
-                    f"<small>👤 {update.author} • 🕒 {update.created_at.strftime('%m-%d %H:%M')}</small></li>"
+                yield _HTML_UPDATE_FMT % (
+                    self._ICONS.get(update.update_type, self._DEFAULT_ICON),
+                    update.url, update.title, update.author,
+                    update.created_at.strftime(_UPDATE_TIME_FMT)
                 )
-            html_parts.append("</ul>")
-
-        return "\n".join(html_parts)
+            yield "</ul>"
 
     def _group_updates_by_repo(self) -> Dict[str, List[RepositoryUpdate]]:
         """按仓库分组更新"""
-        grouped = {}
-        for update in self.updates:
-            repo_key = f"{update.owner}/{update.repo_name}"
-            if repo_key not in grouped:
-                grouped[repo_key] = []
-            grouped[repo_key].append(update)
-
-        # 按时间排序每个仓库的更新
-        for repo_updates in grouped.values():
-            repo_updates.sort(key=lambda x: x.created_at, reverse=True)
-
+        if self._grouped is not None:
+            return self._grouped
+
+        # 仓库保持首次出现的顺序，仓库内按时间倒序；整体只排序一次
+        repo_rank = {key: i for i, key in enumerate(dict.fromkeys(u.full_repo for u in self.updates))}
+        items = sorted(
+            self.updates,
+            key=lambda u: (repo_rank[u.full_repo], -u.created_at.timestamp())
+        )
+        grouped = {key: list(group) for key, group in groupby(items, key=attrgetter('full_repo'))}
+
+        self._grouped = grouped
         return grouped
 
     def _get_update_type_icon(self, update_type: str) -> str:
         """获取更新类型图标"""
-        icons = {
-            'commits': '💾',
-            'issues': '🐛',
-            'pull_requests': '🔄',
-            'releases': '🚀'
-        }
-        return icons.get(update_type, '📌')
+        return self._ICONS.get(update_type, self._DEFAULT_ICON)
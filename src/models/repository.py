@@ -1,12 +1,34 @@
 """
 仓库数据模型
 """
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 
+try:
+    # 可选的C实现ISO 8601解析器，比 datetime.fromisoformat 快一个数量级
+    from ciso8601 import parse_datetime as parse_iso_datetime
+except ImportError:
+    if sys.version_info >= (3, 11):
+        # 3.11 起 fromisoformat 原生支持结尾的'Z'，无需再拼接新字符串
+        parse_iso_datetime = datetime.fromisoformat
+    else:
+        def parse_iso_datetime(value: str) -> datetime:
+            """解析ISO 8601时间字符串，兼容GitHub返回的结尾'Z'"""
+            if value.endswith('Z'):
+                value = value[:-1] + '+00:00'
+            return datetime.fromisoformat(value)
 
-@dataclass
+
+@lru_cache(maxsize=4096)
+def _parse_gh_datetime(date_str: Optional[str]) -> Optional[datetime]:
+    """解析仓库时间字段（带缓存，定期重复获取的仓库时间戳通常不变）"""
+    return parse_iso_datetime(date_str) if date_str else None
+
+
+@dataclass(slots=True)
 class Repository:
     """GitHub仓库模型"""
     id: int
@@ -27,12 +49,6 @@ class Repository:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Repository':
         """从GitHub API响应创建仓库对象"""
-        # 处理时间字段
-        def parse_datetime(date_str: Optional[str]) -> Optional[datetime]:
-            if date_str:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return None
-
         return cls(
             id=data["id"],
             name=data["name"],
@@ -45,13 +61,13 @@ class Repository:
             open_issues_count=data.get("open_issues_count", 0),
             watchers_count=data.get("watchers_count", 0),
             language=data.get("language"),
-            created_at=parse_datetime(data.get("created_at")),
-            updated_at=parse_datetime(data.get("updated_at")),
-            pushed_at=parse_datetime(data.get("pushed_at"))
+            created_at=_parse_gh_datetime(data.get("created_at")),
+            updated_at=_parse_gh_datetime(data.get("updated_at")),
+            pushed_at=_parse_gh_datetime(data.get("pushed_at"))
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class RepositoryUpdate:
     """仓库更新记录"""
     repo_name: str
@@ -63,6 +79,11 @@ class RepositoryUpdate:
     author: str
     created_at: datetime
     metadata: Optional[Dict[str, Any]] = None
+    # "owner/repo_name"，构造时计算一次，供分组和统计使用
+    full_repo: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.full_repo = f"{self.owner}/{self.repo_name}"
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -90,7 +111,7 @@ class RepositoryUpdate:
             description=commit["message"],
             url=commit_data["html_url"],
             author=commit["author"]["name"],
-            created_at=datetime.fromisoformat(commit["author"]["date"].replace('Z', '+00:00')),
+            created_at=parse_iso_datetime(commit["author"]["date"]),
             metadata={"sha": commit_data["sha"]}
         )
 
@@ -105,7 +126,7 @@ class RepositoryUpdate:
             description=issue_data.get("body"),
             url=issue_data["html_url"],
             author=issue_data["user"]["login"],
-            created_at=datetime.fromisoformat(issue_data["created_at"].replace('Z', '+00:00')),
+            created_at=parse_iso_datetime(issue_data["created_at"]),
             metadata={
                 "number": issue_data["number"],
                 "state": issue_data["state"],
@@ -124,7 +145,7 @@ class RepositoryUpdate:
             description=pr_data.get("body"),
             url=pr_data["html_url"],
             author=pr_data["user"]["login"],
-            created_at=datetime.fromisoformat(pr_data["created_at"].replace('Z', '+00:00')),
+            created_at=parse_iso_datetime(pr_data["created_at"]),
             metadata={
                 "number": pr_data["number"],
                 "state": pr_data["state"],
@@ -145,10 +166,72 @@ class RepositoryUpdate:
             description=release_data.get("body"),
             url=release_data["html_url"],
             author=release_data["author"]["login"],
-            created_at=datetime.fromisoformat(release_data["created_at"].replace('Z', '+00:00')),
+            created_at=parse_iso_datetime(release_data["created_at"]),
             metadata={
                 "tag_name": release_data["tag_name"],
                 "prerelease": release_data["prerelease"],
                 "draft": release_data["draft"]
             }
         )
+
+
+@dataclass(slots=True)
+class IssueRow:
+    """每日进展报告中的一条issue记录（时间字段保留GitHub原始字符串）"""
+    number: int
+    title: str
+    state: str
+    user: str
+    created_at: str
+    updated_at: str
+    html_url: str
+    labels: Tuple[str, ...] = ()
+    body: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            'number': self.number,
+            'title': self.title,
+            'state': self.state,
+            'user': self.user,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'html_url': self.html_url,
+            'labels': list(self.labels),
+            'body': self.body
+        }
+
+
+@dataclass(slots=True)
+class PullRequestRow:
+    """每日进展报告中的一条PR记录（时间字段保留GitHub原始字符串）"""
+    number: int
+    title: str
+    state: str
+    user: str
+    created_at: str
+    updated_at: str
+    html_url: str
+    base_branch: str
+    head_branch: str
+    merged_at: Optional[str] = None
+    draft: bool = False
+    body: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            'number': self.number,
+            'title': self.title,
+            'state': self.state,
+            'user': self.user,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'html_url': self.html_url,
+            'merged_at': self.merged_at,
+            'draft': self.draft,
+            'base_branch': self.base_branch,
+            'head_branch': self.head_branch,
+            'body': self.body
+        }
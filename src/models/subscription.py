@@ -5,6 +5,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from enum import Enum
+import re
 import uuid
 
 
@@ -32,6 +33,17 @@ class UpdateType(Enum):
     ALL = "all"
 
 
+# 字符串值到枚举成员的查找表，避免重复调用枚举构造函数
+NOTIFICATION_TYPE_MAP = {nt.value: nt for nt in NotificationType}
+UPDATE_FREQUENCY_MAP = {uf.value: uf for uf in UpdateFrequency}
+UPDATE_TYPE_MAP = {ut.value: ut for ut in UpdateType}
+# 全部更新类型，模块导入时生成一次
+ALL_UPDATE_TYPES = tuple(UpdateType)
+
+# GitHub仓库URL：允许http、结尾的 .git，以及仓库名之后的子路径、查询参数或锚点
+_REPO_URL_RE = re.compile(r'^https?://github\.com/([^/?#]+)/([^/?#]+?)(?:\.git)?(?:[/?#].*)?$')
+
+
 def utc_now():
     """获取UTC时间的datetime对象"""
     return datetime.now(timezone.utc)
@@ -57,7 +69,7 @@ def ensure_timezone_naive(dt: datetime) -> datetime:
     return dt
 
 
-@dataclass
+@dataclass(slots=True)
 class Subscription:
     """订阅模型"""
     repo_url: str
@@ -76,24 +88,20 @@ class Subscription:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Subscription':
         """从字典创建订阅对象"""
-        # 处理枚举类型转换
-        notification_types = []
-        for nt in data.get('notification_types', []):
-            if isinstance(nt, str):
-                notification_types.append(NotificationType(nt))
-            else:
-                notification_types.append(nt)
+        # 处理枚举类型转换（查表代替逐个调用枚举构造函数）
+        notification_types = [
+            nt if isinstance(nt, NotificationType) else NOTIFICATION_TYPE_MAP[nt]
+            for nt in data.get('notification_types', [])
+        ]
 
         frequency = data.get('frequency', 'daily')
-        if isinstance(frequency, str):
-            frequency = UpdateFrequency(frequency)
+        if not isinstance(frequency, UpdateFrequency):
+            frequency = UPDATE_FREQUENCY_MAP[frequency]
 
-        update_types = []
-        for ut in data.get('update_types', ['all']):
-            if isinstance(ut, str):
-                update_types.append(UpdateType(ut))
-            else:
-                update_types.append(ut)
+        update_types = [
+            ut if isinstance(ut, UpdateType) else UPDATE_TYPE_MAP[ut]
+            for ut in data.get('update_types', ['all'])
+        ]
 
         # 处理时间字段 - 确保时区一致性
         created_at = data.get('created_at')
@@ -154,11 +162,10 @@ class Subscription:
     @staticmethod
     def parse_repo_url(repo_url: str) -> tuple[str, str]:
         """从仓库URL解析owner和repo_name"""
-        if repo_url.startswith('https://github.com/'):
-            parts = repo_url.replace('https://github.com/', '').strip('/').split('/')
-            if len(parts) >= 2:
-                return parts[0], parts[1]
-        raise ValueError(f"Invalid GitHub repository URL: {repo_url}")
+        match = _REPO_URL_RE.match(repo_url)
+        if not match:
+            raise ValueError(f"Invalid GitHub repository URL: {repo_url}")
+        return match.group(1), match.group(2)
 
     @classmethod
     def create_from_url(cls, repo_url: str, **kwargs) -> 'Subscription':
@@ -1,14 +1,24 @@
-"""服务层模块"""
-from .github_service import GitHubService
-from .subscription_service import SubscriptionService
-from .update_service import UpdateService
-from .notification_service import NotificationService
-from .report_service import ReportService
-
-__all__ = [
-    'GitHubService',
-    'SubscriptionService',
-    'UpdateService',
-    'NotificationService',
-    'ReportService'
-]
+"""服务层模块
+
+各服务按需导入：导入某一个服务子模块时不会连带加载其余服务（如 openai）。
+"""
+import importlib
+
+_SERVICE_MODULES = {
+    'GitHubService': '.github_service',
+    'SubscriptionService': '.subscription_service',
+    'UpdateService': '.update_service',
+    'NotificationService': '.notification_service',
+    'ReportService': '.report_service',
+}
+
+__all__ = list(_SERVICE_MODULES)
+
+
+def __getattr__(name):
+    module_name = _SERVICE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
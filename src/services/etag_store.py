@@ -0,0 +1,123 @@
+"""
+ETag 持久化存储 - 进程重启后仍可对已请求过的URL发送条件请求（304不计入速率限制）
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+try:
+    # 可选的更快JSON库，dumps 直接返回 bytes
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    _json_loads = json.loads
+
+
+# 条目默认有效期（秒）和最大条目数，超出部分按更新时间淘汰
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 4096
+# 每写入这么多条做一次淘汰，避免每次写入都扫描整表
+_PRUNE_INTERVAL = 256
+
+
+def default_etag_path() -> Path:
+    """默认存储文件路径（遵循 XDG_CACHE_HOME）"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "github-sentinel" / "etag-cache.db"
+
+
+class EtagStore:
+    """基于 SQLite 的 GitHub 响应 ETag 缓存
+
+    读写是同步的磁盘I/O，GitHubService 通过 asyncio.to_thread 调用，不阻塞事件循环；
+    连接允许跨线程使用，并由锁串行化。
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_age: Optional[float] = DEFAULT_MAX_AGE,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = Path(db_path) if db_path else default_etag_path()
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """首次使用时打开数据库、建表并淘汰过期条目（WAL模式，批量导出时读写互不阻塞）"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "url TEXT PRIMARY KEY, etag TEXT NOT NULL, body BLOB NOT NULL, "
+                "next_url TEXT, updated_at REAL NOT NULL)"
+            )
+            self._prune(self._conn)
+        return self._conn
+
+    def _prune(self, conn: sqlite3.Connection):
+        """删除过期条目，并只保留最近更新的 max_entries 条"""
+        if self.max_age is not None:
+            conn.execute("DELETE FROM cache WHERE updated_at < ?", (time.time() - self.max_age,))
+        conn.execute(
+            "DELETE FROM cache WHERE url NOT IN "
+            "(SELECT url FROM cache ORDER BY updated_at DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+
+    def get(self, key: str) -> Optional[Tuple[str, Any, Optional[str]]]:
+        """读取缓存，返回 (ETag, 响应数据, 下一页URL)，未命中或已过期返回 None"""
+        min_updated = time.time() - self.max_age if self.max_age is not None else 0
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT etag, body, next_url FROM cache WHERE url = ? AND updated_at >= ?",
+                    (key, min_updated)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"读取ETag缓存失败: {e}")
+            return None
+        if row is None:
+            return None
+        try:
+            return row[0], _json_loads(row[1]), row[2]
+        except ValueError as e:
+            self.logger.warning(f"ETag缓存内容无法解析: {e}")
+            return None
+
+    def set(self, key: str, etag: str, data: Any, next_url: Optional[str] = None):
+        """写入缓存，每写入 _PRUNE_INTERVAL 条淘汰一次"""
+        try:
+            body = _json_dumps(data)
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (url, etag, body, next_url, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, etag, body, next_url, time.time())
+                )
+                self._writes += 1
+                if self._writes % _PRUNE_INTERVAL == 0:
+                    self._prune(conn)
+        except (sqlite3.Error, TypeError) as e:
+            self.logger.warning(f"写入ETag缓存失败: {e}")
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._connect().execute("DELETE FROM cache")
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -3,24 +3,32 @@ GitHub API 服务
 """
 import aiohttp
 import asyncio
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 import logging
 import json
 import os
+import time
 from pathlib import Path
+from urllib.parse import urlencode
 
-from ..models.repository import Repository, RepositoryUpdate
+from ..models.repository import (
+    Repository, RepositoryUpdate, IssueRow, PullRequestRow, parse_iso_datetime
+)
+from .etag_store import EtagStore
+
+try:
+    # 可选：C实现的JSON解析，GitHub的issues/PR列表响应体较大
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 
 def parse_github_datetime(date_string: str) -> datetime:
     """解析GitHub API返回的时间字符串，确保返回timezone-aware的datetime"""
-    if date_string.endswith('Z'):
-        # GitHub API通常返回UTC时间，以'Z'结尾
-        date_string = date_string.replace('Z', '+00:00')
-
     try:
-        dt = datetime.fromisoformat(date_string)
+        dt = parse_iso_datetime(date_string)
         # 确保是timezone-aware的
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
@@ -43,10 +51,44 @@ def ensure_utc_datetime(dt: datetime) -> datetime:
         return dt.astimezone(timezone.utc)
 
 
+def to_github_iso(dt: datetime) -> str:
+    """格式化为GitHub API使用的UTC时间字符串（YYYY-MM-DDTHH:MM:SSZ）
+
+    该固定格式下字符串的字典序与时间先后一致，可直接与API返回的时间字符串比较。
+    """
+    return ensure_utc_datetime(dt).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def to_github_since(dt: datetime, granularity: int = 3600) -> str:
+    """格式化发给GitHub的 since 查询参数，向下取整到 granularity 秒
+
+    调用方的 since 通常由 datetime.now() 推算，精确到秒会使每次运行的请求URL都不同，
+    ETag缓存无法命中；取整后同一时段内的请求URL相同，精确的时间过滤由客户端完成。
+    """
+    ts = ensure_utc_datetime(dt).timestamp()
+    return to_github_iso(datetime.fromtimestamp(ts - ts % granularity, timezone.utc))
+
+
+def _truncate(text: str, limit: int = 150) -> str:
+    """截断过长的文本并追加省略号
+
+    只切取前 limit+1 个字符判断是否超长，超大文本不会被完整复制。
+    """
+    head = text[:limit + 1]
+    return head if len(head) <= limit else head[:limit] + "..."
+
+
 class GitHubService:
     """GitHub API 服务类"""
 
-    def __init__(self, token: str, rate_limit_per_hour: int = 5000, timeout: int = 30):
+    # 支持的更新类型，与 RepositoryUpdate.update_type 取值一致
+    UPDATE_TYPES = ("commits", "issues", "pull_requests", "releases")
+    # ETag缓存最多保留的URL数，超出时淘汰最久未使用的条目
+    ETAG_CACHE_SIZE = 512
+
+    def __init__(self, token: str, rate_limit_per_hour: int = 5000, timeout: int = 30,
+                 session: Optional[aiohttp.ClientSession] = None, max_concurrency: int = 10,
+                 use_search: bool = False, etag_store: Optional[EtagStore] = None):
         self.token = token
         self.base_url = "https://api.github.com"
         self.headers = {
@@ -56,39 +98,172 @@ class GitHubService:
             "User-Agent": "GitHub-Sentinel/1.0"
         }
         self.rate_limit_per_hour = rate_limit_per_hour
-        self.requests_made = 0
-        self.last_reset = datetime.now(timezone.utc)
+        # 剩余配额与重置时间（epoch秒），以GitHub响应头 X-RateLimit-* 为准
+        self._remaining = rate_limit_per_hour
+        self._reset_ts = time.time() + 3600
+        # 客户端令牌桶：按 rate_limit_per_hour/3600 个/秒匀速补充，平滑突发请求
+        self._capacity = float(rate_limit_per_hour)
+        self._tokens = self._capacity
+        self._refill_rate = max(rate_limit_per_hour, 1) / 3600.0
+        self._last_refill = time.monotonic()
         self.timeout = timeout
         self.logger = logging.getLogger(__name__)
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        # 外部传入的会话由调用方负责关闭；认证头按请求发送，会话可与其他服务共享
+        self._shared_session = session
+        # 长连接会话，首次请求时在事件循环内创建，复用TCP/TLS连接
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # 限制同时在途的API请求数，与会话一样按事件循环创建
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # 通过Search API获取issues，服务端排除PR；Search API限额更严格（30次/分钟），默认关闭
+        self.use_search = use_search
+        # 条件请求缓存：(url, 排序后的参数) -> (ETag, 响应数据, 下一页URL)
+        self._etag_cache: "OrderedDict[Tuple[str, tuple], Tuple[str, Any, Optional[str]]]" = OrderedDict()
+        # 可选的磁盘ETag存储，内存未命中时查询，使重启后的首次请求也能得到304
+        self.etag_store = etag_store
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """获取当前事件循环的并发信号量"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享的HTTP会话（连接池）"""
+        if self._shared_session is not None and not self._shared_session.closed:
+            return self._shared_session
+
+        loop = asyncio.get_running_loop()
+        # Web界面每次调用都会新建事件循环，会话不能跨循环复用
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=20,
+                limit_per_host=10,
+                ttl_dns_cache=300,
+                # 轮询间隔内保持空闲连接，下一批请求可直接复用
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+            self._session_loop = loop
+        return self._session
 
-    async def _check_rate_limit(self):
-        """检查API速率限制"""
-        now = datetime.now(timezone.utc)
-        if (now - self.last_reset).total_seconds() > 3600:
-            self.requests_made = 0
-            self.last_reset = now
-
-        if self.requests_made >= self.rate_limit_per_hour:
-            wait_time = 3600 - (now - self.last_reset).total_seconds()
+    async def close(self):
+        """关闭自建的HTTP会话（外部传入的会话不在此关闭）"""
+        if self._session is not None and not self._session.closed:
+            try:
+                await self._session.close()
+            except RuntimeError:
+                # 会话所属的事件循环已关闭，连接无法再按原循环关闭；
+                # 分离连接器，避免残留 "Unclosed client session"
+                self._session.detach()
+        self._session = None
+        self._session_loop = None
+
+    async def __aenter__(self) -> "GitHubService":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _refill_tokens(self) -> None:
+        """按流逝时间补充令牌"""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._refill_rate)
+        self._last_refill = now
+
+    async def _wait_for_rate_limit(self):
+        """发请求前取一个令牌；服务端配额耗尽时等待到GitHub给出的重置时间"""
+        if self._remaining <= 0:
+            wait_time = self._reset_ts - time.time()
             if wait_time > 0:
                 self.logger.warning(f"达到速率限制，等待 {wait_time:.0f} 秒")
                 await asyncio.sleep(wait_time)
-                self.requests_made = 0
-                self.last_reset = datetime.now(timezone.utc)
+            # 重置后的实际配额以下一次响应头为准
+            self._remaining = self.rate_limit_per_hour
+            self._tokens = self._capacity
+            self._last_refill = time.monotonic()
+
+        while True:
+            self._refill_tokens()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._refill_rate)
+
+    def _update_rate_limit(self, headers) -> None:
+        """根据响应头更新剩余配额和重置时间
+
+        只跟踪 core 配额：Search API 等有各自独立的配额（如30次/分钟），
+        其响应头不能覆盖 core 的剩余数和令牌桶状态。
+        """
+        if headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            try:
+                self._remaining, self._reset_ts = int(remaining), float(reset)
+            except ValueError:
+                return
+            # 以服务端剩余配额校准令牌数
+            self._refill_tokens()
+            self._tokens = min(self._tokens, float(self._remaining))
 
     async def _make_request(self, url: str, params: Optional[Dict] = None) -> Dict:
         """发起API请求"""
-        await self._check_rate_limit()
-
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        data, _ = await self._request(url, params)
+        return data
+
+    async def _request(self, url: str, params: Optional[Dict] = None) -> Tuple[Any, Optional[str]]:
+        """发起API请求，返回 (数据, 下一页URL)
+
+        速率限制耗尽导致的403会等待重置后重试一次。
+        已缓存ETag的URL发送条件请求，304（不计入速率限制）时直接返回缓存内容。
+        """
+        if self._session is not None and self._session_loop is not asyncio.get_running_loop():
+            # 事件循环已更换（如Web界面每次调用新建循环），先关闭旧循环上的会话再重建
+            await self.close()
+        session = self._get_session()
+        cache_key = (url, tuple(sorted(params.items())) if params else ())
+        store_key = f"{url}?{urlencode(cache_key[1])}" if self.etag_store is not None else None
+        cached = self._etag_cache.get(cache_key)
+        if cached:
+            self._etag_cache.move_to_end(cache_key)
+        elif store_key is not None:
+            # SQLite读写放到线程中执行，不阻塞事件循环
+            cached = await asyncio.to_thread(self.etag_store.get, store_key)
+            if cached:
+                self._remember_etag(cache_key, cached)
+        headers = {**self.headers, 'If-None-Match': cached[0]} if cached else self.headers
+
+        for attempt in range(2):
+            await self._wait_for_rate_limit()
             try:
-                async with session.get(url, headers=self.headers, params=params) as response:
-                    self.requests_made += 1
-
-                    if response.status == 200:
-                        return await response.json()
+                async with self._get_semaphore(), \
+                        session.get(url, params=params, headers=headers,
+                                    timeout=self._timeout) as response:
+                    self._update_rate_limit(response.headers)
+
+                    if response.status == 304 and cached:
+                        return cached[1], cached[2]
+                    elif response.status == 200:
+                        next_link = response.links.get('next')
+                        next_url = str(next_link['url']) if next_link else None
+                        data = await response.json(loads=_json_loads)
+                        etag = response.headers.get('ETag')
+                        if etag:
+                            self._remember_etag(cache_key, (etag, data, next_url))
+                        if not etag or store_key is None:
+                            return data, next_url
                     elif response.status == 403:
+                        if self._remaining == 0 and attempt == 0:
+                            continue
                         self.logger.error(f"API访问被拒绝: {response.status}")
                         raise Exception(f"GitHub API访问被拒绝: {response.status}")
                     elif response.status == 404:
@@ -98,6 +273,10 @@ class GitHubService:
                         self.logger.error(f"API请求失败: {response.status}")
                         raise Exception(f"GitHub API请求失败: {response.status}")
 
+                # 释放连接和并发名额后再写磁盘ETag存储
+                await asyncio.to_thread(self.etag_store.set, store_key, etag, data, next_url)
+                return data, next_url
+
             except asyncio.TimeoutError:
                 self.logger.error(f"请求超时: {url}")
                 raise Exception(f"GitHub API请求超时: {url}")
@@ -105,23 +284,220 @@ class GitHubService:
                 self.logger.error(f"请求异常: {str(e)}")
                 raise
 
+    def _remember_etag(self, cache_key: Tuple[str, tuple],
+                       entry: Tuple[str, Any, Optional[str]]) -> None:
+        """写入内存ETag缓存，超出容量时淘汰最久未使用的条目"""
+        self._etag_cache[cache_key] = entry
+        self._etag_cache.move_to_end(cache_key)
+        if len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+            self._etag_cache.popitem(last=False)
+
+    async def _iter_paginated(self, url: str, params: Optional[Dict] = None,
+                              stop: Optional[Callable[[Dict], bool]] = None,
+                              max_pages: int = 10,
+                              items_key: Optional[str] = None) -> AsyncIterator[Dict]:
+        """按 Link 头逐页获取并逐条产出，遇到 stop(item) 为真的条目即停止
+
+        列表需按时间倒序返回，stop 判断条目是否已早于所需时间范围。
+        items_key 用于响应体为对象的接口（如Search API的 'items'）。
+        """
+        for _ in range(max_pages):
+            data, next_url = await self._request(url, params)
+            if items_key is not None:
+                data = data.get(items_key, [])
+            for item in data:
+                if stop is not None and self._should_stop(stop, item):
+                    return
+                yield item
+            if not next_url:
+                return
+            # 下一页URL已包含全部查询参数
+            url, params = next_url, None
+
+    @staticmethod
+    def _should_stop(stop: Callable[[Dict], bool], item: Dict) -> bool:
+        """判断是否停止翻页；条目缺少时间字段等无法判断时不停止，由 _safe_convert 跳过该条"""
+        try:
+            return stop(item)
+        except (KeyError, TypeError):
+            return False
+
+    async def _paginate(self, url: str, params: Optional[Dict] = None,
+                        stop: Optional[Callable[[Dict], bool]] = None,
+                        max_pages: int = 10, items_key: Optional[str] = None) -> List[Dict]:
+        """按 Link 头获取全部页面，返回条目列表"""
+        return [item async for item in self._iter_paginated(url, params, stop, max_pages, items_key)]
+
     async def get_repository_info(self, owner: str, repo: str) -> Repository:
         """获取仓库基本信息"""
         url = f"{self.base_url}/repos/{owner}/{repo}"
-        data = await self._make_request(url)
+        return Repository.from_dict(await self._make_request(url))
+
+    async def validate_repository(self, owner: str, repo: str) -> bool:
+        """检查仓库是否存在且可访问"""
+        try:
+            await self._make_request(f"{self.base_url}/repos/{owner}/{repo}")
+            return True
+        except Exception:
+            return False
+
+    def _safe_convert(self, factory: Callable[[str, str, Dict], RepositoryUpdate],
+                      owner: str, repo: str, item: Dict) -> Optional[RepositoryUpdate]:
+        """转换单条API数据，字段缺失等异常时记录日志并返回 None，不影响其余条目"""
+        try:
+            return factory(owner, repo, item)
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.warning(f"跳过无法解析的条目 {owner}/{repo}: {e!r}")
+            return None
+
+    async def iter_recent_commits(self, owner: str, repo: str, since: datetime) -> AsyncIterator[RepositoryUpdate]:
+        """逐条产出指定时间之后的提交，边翻页边产出
+
+        不在客户端提前停止：服务端的 since 按提交者时间过滤，而变基、cherry-pick
+        的提交作者时间可能早于 since，列表顺序也不保证按时间严格递减。
+        """
+        since_iso = to_github_iso(since)
+        url = f"{self.base_url}/repos/{owner}/{repo}/commits"
+        params = {'since': to_github_since(since), 'per_page': 100}
+        async for item in self._iter_paginated(url, params):
+            # 服务端 since 已取整，按提交者时间精确过滤（缺字段的条目交给 _safe_convert 处理）
+            try:
+                if item['commit']['committer']['date'] < since_iso:
+                    continue
+            except (KeyError, TypeError):
+                pass
+            update = self._safe_convert(RepositoryUpdate.from_commit, owner, repo, item)
+            if update is not None:
+                yield update
+
+    async def iter_recent_issues(self, owner: str, repo: str, since: datetime) -> AsyncIterator[RepositoryUpdate]:
+        """逐条产出指定时间之后有更新的 issues（不含 pull requests）"""
+        since_iso = to_github_iso(since)
+        if self.use_search:
+            # 通过Search API获取，由服务端用 is:issue 排除PR
+            url = f"{self.base_url}/search/issues"
+            params = {
+                'q': f"repo:{owner}/{repo} is:issue updated:>={to_github_since(since)}",
+                'sort': 'updated',
+                'order': 'desc',
+                'per_page': 100
+            }
+            async for item in self._iter_paginated(
+                url, params, stop=lambda i: i['updated_at'] < since_iso, items_key='items'
+            ):
+                update = self._safe_convert(RepositoryUpdate.from_issue, owner, repo, item)
+                if update is not None:
+                    yield update
+            return
+
+        url = f"{self.base_url}/repos/{owner}/{repo}/issues"
+        params = {
+            'state': 'all',
+            'since': to_github_since(since),
+            'sort': 'updated',
+            'direction': 'desc',
+            'per_page': 100
+        }
+        async for item in self._iter_paginated(
+            url, params, stop=lambda i: i['updated_at'] < since_iso
+        ):
+            if 'pull_request' in item:
+                continue
+            update = self._safe_convert(RepositoryUpdate.from_issue, owner, repo, item)
+            if update is not None:
+                yield update
 
-        return Repository(
-            name=data['name'],
-            full_name=data['full_name'],
-            description=data.get('description', ''),
-            html_url=data['html_url'],
-            language=data.get('language', ''),
-            stars=data['stargazers_count'],
-            forks=data['forks_count'],
-            updated_at=parse_github_datetime(data['updated_at']),
-            created_at=parse_github_datetime(data['created_at'])
+    async def iter_recent_pull_requests(self, owner: str, repo: str, since: datetime) -> AsyncIterator[RepositoryUpdate]:
+        """逐条产出指定时间之后有更新的 pull requests"""
+        since_iso = to_github_iso(since)
+        url = f"{self.base_url}/repos/{owner}/{repo}/pulls"
+        params = {'state': 'all', 'sort': 'updated', 'direction': 'desc', 'per_page': 100}
+        # 按更新时间倒序返回，遇到早于since的即可停止
+        async for item in self._iter_paginated(
+            url, params, stop=lambda pr: pr['updated_at'] < since_iso
+        ):
+            update = self._safe_convert(RepositoryUpdate.from_pull_request, owner, repo, item)
+            if update is not None:
+                yield update
+
+    async def iter_recent_releases(self, owner: str, repo: str, since: datetime) -> AsyncIterator[RepositoryUpdate]:
+        """逐条产出指定时间之后创建的 releases"""
+        since_iso = to_github_iso(since)
+        url = f"{self.base_url}/repos/{owner}/{repo}/releases"
+        async for item in self._iter_paginated(
+            url, {'per_page': 100}, stop=lambda r: r['created_at'] < since_iso
+        ):
+            update = self._safe_convert(RepositoryUpdate.from_release, owner, repo, item)
+            if update is not None:
+                yield update
+
+    async def get_recent_commits(self, owner: str, repo: str, since: datetime) -> List[RepositoryUpdate]:
+        """获取指定时间之后的提交"""
+        return [update async for update in self.iter_recent_commits(owner, repo, since)]
+
+    async def get_recent_issues(self, owner: str, repo: str, since: datetime) -> List[RepositoryUpdate]:
+        """获取指定时间之后有更新的 issues（不含 pull requests）"""
+        return [update async for update in self.iter_recent_issues(owner, repo, since)]
+
+    async def get_recent_pull_requests(self, owner: str, repo: str, since: datetime) -> List[RepositoryUpdate]:
+        """获取指定时间之后有更新的 pull requests"""
+        return [update async for update in self.iter_recent_pull_requests(owner, repo, since)]
+
+    async def get_recent_releases(self, owner: str, repo: str, since: datetime) -> List[RepositoryUpdate]:
+        """获取指定时间之后创建的 releases"""
+        return [update async for update in self.iter_recent_releases(owner, repo, since)]
+
+    async def get_all_updates(self, owner: str, repo: str, since: datetime,
+                              types: Optional[Iterable[str]] = None) -> List[RepositoryUpdate]:
+        """并发获取一个仓库的多种更新，types 为空时获取全部类型
+
+        单个类型请求失败只记录日志，不影响其他类型的结果。
+        """
+        fetchers = {
+            "commits": self.get_recent_commits,
+            "issues": self.get_recent_issues,
+            "pull_requests": self.get_recent_pull_requests,
+            "releases": self.get_recent_releases,
+        }
+        selected = [t for t in self.UPDATE_TYPES if types is None or t in types]
+        results = await asyncio.gather(
+            *(fetchers[t](owner, repo, since) for t in selected),
+            return_exceptions=True
         )
 
+        updates = []
+        for update_type, result in zip(selected, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"获取 {owner}/{repo} 的 {update_type} 失败: {result}")
+                continue
+            updates.extend(result)
+        return updates
+
+    async def get_updates_for_repos(self, repos: Iterable[Tuple[str, str]], since: datetime,
+                                    types: Optional[Iterable[str]] = None) -> Dict[str, List[RepositoryUpdate]]:
+        """并发获取多个仓库的更新，返回 {"owner/repo": 更新列表}
+
+        并发请求总数受 max_concurrency 限制。
+        """
+        repos = list(repos)
+        results = await asyncio.gather(
+            *(self.get_all_updates(owner, repo, since, types) for owner, repo in repos)
+        )
+        return {f"{owner}/{repo}": updates for (owner, repo), updates in zip(repos, results)}
+
+    async def get_rate_limit_status(self) -> Dict:
+        """获取API速率限制状态（core资源）"""
+        url = f"{self.base_url}/rate_limit"
+        data = await self._make_request(url)
+        core = data.get('resources', {}).get('core', data.get('rate', {}))
+
+        return {
+            'limit': core.get('limit'),
+            'remaining': core.get('remaining'),
+            'used': core.get('used'),
+            'reset': core.get('reset')
+        }
+
     async def get_repository_updates(self, owner: str, repo: str, since: datetime) -> List[RepositoryUpdate]:
         """获取仓库更新信息"""
         # 确保since参数是timezone-aware的
@@ -151,8 +527,8 @@ class GitHubService:
 
     async def get_issues(self, owner: str, repo: str, since: Optional[datetime] = None,
                         until: Optional[datetime] = None, state: str = "all",
-                        per_page: int = 50, include_body: bool = False) -> List[Dict]:
-        """获取仓库的 issues 列表"""
+                        per_page: int = 100, include_body: bool = False) -> List[IssueRow]:
+        """获取仓库的 issues 列表（按更新时间倒序分页，越过since即停止翻页）"""
         url = f"{self.base_url}/repos/{owner}/{repo}/issues"
         params = {
             'state': state,
@@ -161,46 +537,43 @@ class GitHubService:
             'direction': 'desc'
         }
 
+        # 时间边界预先格式化为GitHub的时间字符串，循环内直接做字符串比较
+        stop = None
         if since:
-            since = ensure_utc_datetime(since)
-            params['since'] = since.isoformat()
+            since_iso = to_github_iso(since)
+            params['since'] = to_github_since(since)
+            stop = lambda item: item['updated_at'] < since_iso
+        until_iso = to_github_iso(until) if until else None
 
-        data = await self._make_request(url, params)
+        data = await self._paginate(url, params, stop=stop)
 
         # 过滤掉 pull requests (GitHub API 中 issues 包含 pull requests)
         issues = []
         for item in data:
             if 'pull_request' not in item:
                 # 时间过滤
-                if until:
-                    until = ensure_utc_datetime(until)
-                    updated_at = parse_github_datetime(item['updated_at'])
-                    if updated_at > until:
-                        continue
-
-                issue_data = {
-                    'number': item['number'],
-                    'title': item['title'],
-                    'state': item['state'],
-                    'user': item['user']['login'],
-                    'created_at': item['created_at'],
-                    'updated_at': item['updated_at'],
-                    'html_url': item['html_url'],
-                    'labels': [label['name'] for label in item['labels']]
-                }
-
-                if include_body:
-                    issue_data['body'] = item.get('body', '')
-
-                issues.append(issue_data)
+                if until_iso and item['updated_at'] > until_iso:
+                    continue
+
+                issues.append(IssueRow(
+                    item['number'],
+                    item['title'],
+                    item['state'],
+                    item['user']['login'],
+                    item['created_at'],
+                    item['updated_at'],
+                    item['html_url'],
+                    tuple(label['name'] for label in item['labels']),
+                    item.get('body') if include_body else None
+                ))
 
         return issues
 
     async def get_pull_requests(self, owner: str, repo: str, since: Optional[datetime] = None,
                                until: Optional[datetime] = None, state: str = "all",
-                               per_page: int = 50, merged_only: bool = False,
-                               include_body: bool = False) -> List[Dict]:
-        """获取仓库的 pull requests 列表"""
+                               per_page: int = 100, merged_only: bool = False,
+                               include_body: bool = False) -> List[PullRequestRow]:
+        """获取仓库的 pull requests 列表（按更新时间倒序分页，越过since即停止翻页）"""
         url = f"{self.base_url}/repos/{owner}/{repo}/pulls"
         params = {
             'state': state,
@@ -209,46 +582,42 @@ class GitHubService:
             'direction': 'desc'
         }
 
-        data = await self._make_request(url, params)
+        # 时间边界预先格式化为GitHub的时间字符串，循环内直接做字符串比较
+        stop = None
+        if since:
+            since_iso = to_github_iso(since)
+            stop = lambda item: item['updated_at'] < since_iso
+        until_iso = to_github_iso(until) if until else None
+
+        data = await self._paginate(url, params, stop=stop)
 
         pull_requests = []
         for item in data:
             # 时间过滤
-            if since:
-                updated_at = datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00'))
-                if updated_at < since:
-                    continue
-
-            if until:
-                updated_at = datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00'))
-                if updated_at > until:
-                    continue
+            if until_iso and item['updated_at'] > until_iso:
+                continue
 
             # 如果只要merged的PR
             if merged_only and not item.get('merged_at'):
                 continue
 
-            pr_data = {
-                'number': item['number'],
-                'title': item['title'],
-                'state': item['state'],
-                'user': item['user']['login'],
-                'created_at': item['created_at'],
-                'updated_at': item['updated_at'],
-                'html_url': item['html_url'],
-                'merged_at': item.get('merged_at'),
-                'draft': item.get('draft', False),
-                'base_branch': item['base']['ref'],
-                'head_branch': item['head']['ref']
-            }
-
-            # 可选包含body内容
-            if include_body and item.get('body'):
-                # 限制描述长度，减少token使用
-                body = item['body'][:150] + "..." if len(item['body']) > 150 else item['body']
-                pr_data['body'] = body
-
-            pull_requests.append(pr_data)
+            # 可选包含body内容，限制描述长度，减少token使用
+            body = item.get('body') if include_body else None
+
+            pull_requests.append(PullRequestRow(
+                item['number'],
+                item['title'],
+                item['state'],
+                item['user']['login'],
+                item['created_at'],
+                item['updated_at'],
+                item['html_url'],
+                item['base']['ref'],
+                item['head']['ref'],
+                item.get('merged_at'),
+                item.get('draft', False),
+                _truncate(body) if body else None
+            ))
 
         return pull_requests
 
@@ -268,26 +637,30 @@ class GitHubService:
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
 
-        # 根据模式调整参数
+        # 根据模式调整参数，issues 与 PR 并发获取
         if compact_mode:
             # 紧凑模式：只获取merged PR和closed issues，不包含body
-            issues = await self.get_issues(
-                owner, repo, since=since, until=until,
-                state="closed", per_page=20, include_body=False
-            )
-            pull_requests = await self.get_pull_requests(
-                owner, repo, since=since, until=until,
-                per_page=20, merged_only=True, include_body=False
+            issues, pull_requests = await asyncio.gather(
+                self.get_issues(
+                    owner, repo, since=since, until=until,
+                    state="closed", include_body=False
+                ),
+                self.get_pull_requests(
+                    owner, repo, since=since, until=until,
+                    merged_only=True, include_body=False
+                )
             )
         else:
             # 完整模式：获取所有状态的issues和PR
-            issues = await self.get_issues(
-                owner, repo, since=since, until=until,
-                state="all", per_page=50, include_body=True
-            )
-            pull_requests = await self.get_pull_requests(
-                owner, repo, since=since, until=until,
-                state="all", per_page=50, merged_only=False, include_body=True
+            issues, pull_requests = await asyncio.gather(
+                self.get_issues(
+                    owner, repo, since=since, until=until,
+                    state="all", include_body=True
+                ),
+                self.get_pull_requests(
+                    owner, repo, since=since, until=until,
+                    state="all", merged_only=False, include_body=True
+                )
             )
 
         # 生成文件名
@@ -295,20 +668,37 @@ class GitHubService:
         filename = f"{repo}_{date_str}.md"
         filepath = output_path / filename
 
-        # 生成 Markdown 内容
-        content = self._generate_markdown_content(
+        # 生成 Markdown 内容（纯CPU工作，放到线程中执行，不阻塞其他仓库的请求）
+        content = await asyncio.to_thread(
+            self._generate_markdown_content,
             owner, repo, issues, pull_requests, since, until, compact_mode
         )
 
-        # 写入文件
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # 写入文件（在线程中执行，避免批量导出时阻塞事件循环）
+        await asyncio.to_thread(filepath.write_text, content, encoding='utf-8')
 
         self.logger.info(f"每日进展报告已导出: {filepath}")
         return str(filepath)
 
+    async def export_daily_progress_bulk(self, repos: Iterable[Tuple[str, str]],
+                                         concurrency: int = 8, **kwargs) -> List:
+        """并发导出多个仓库的每日进展，返回与 repos 顺序一致的文件路径列表
+
+        单个仓库失败时对应位置为异常对象，不影响其他仓库。其余参数同 export_daily_progress。
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def export_one(owner: str, repo: str) -> str:
+            async with semaphore:
+                return await self.export_daily_progress(owner, repo, **kwargs)
+
+        return await asyncio.gather(
+            *(export_one(owner, repo) for owner, repo in repos),
+            return_exceptions=True
+        )
+
     def _generate_markdown_content(self, owner: str, repo: str,
-                                  issues: List[Dict], pull_requests: List[Dict],
+                                  issues: List[IssueRow], pull_requests: List[PullRequestRow],
                                   since: datetime, until: datetime,
                                   compact_mode: bool) -> str:
         """生成 Markdown 内容"""
@@ -316,7 +706,7 @@ class GitHubService:
         time_range = f"{since.strftime('%Y-%m-%d %H:%M')} 至 {until.strftime('%Y-%m-%d %H:%M')} (UTC)"
         mode_str = "紧凑模式" if compact_mode else "完整模式"
 
-        content = f"""# {owner}/{repo} - 每日进展报告
+        parts: List[str] = [f"""# {owner}/{repo} - 每日进展报告
 
 **日期**: {date_str}  
 **时间范围**: {time_range}  
@@ -334,78 +724,86 @@ class GitHubService:
 
 ## 🔀 Pull Requests {f'(已合并)' if compact_mode else ''}
 
-"""
+"""]
+        append = parts.append
 
         if pull_requests:
             for pr in pull_requests:
-                status_icon = "✅" if pr.get('merged_at') else ("🔀" if pr['state'] == 'open' else "❌")
-                merge_info = f" - 合并时间: {pr['merged_at']}" if pr.get('merged_at') else ""
-                draft_info = " 📝" if pr.get('draft') else ""
-
-                content += f"### {status_icon} #{pr['number']} {pr['title']}{draft_info}\n\n"
-                content += f"- **作者**: {pr['user']}\n"
-                content += f"- **状态**: {pr['state']}\n"
-                content += f"- **分支**: {pr['head_branch']} → {pr['base_branch']}\n"
-                content += f"- **创建时间**: {pr['created_at']}\n"
-                if merge_info:
-                    content += merge_info + "\n"
-                content += f"- **链接**: [{pr['html_url']}]({pr['html_url']})\n"
-
-                if not compact_mode and pr.get('body'):
-                    content += f"- **描述**: {pr['body']}\n"
-
-                content += "\n"
+                status_icon = "✅" if pr.merged_at else ("🔀" if pr.state == 'open' else "❌")
+                draft_info = " 📝" if pr.draft else ""
+
+                append(
+                    f"### {status_icon} #{pr.number} {pr.title}{draft_info}\n\n"
+                    f"- **作者**: {pr.user}\n"
+                    f"- **状态**: {pr.state}\n"
+                    f"- **分支**: {pr.head_branch} → {pr.base_branch}\n"
+                    f"- **创建时间**: {pr.created_at}\n"
+                )
+                if pr.merged_at:
+                    append(f" - 合并时间: {pr.merged_at}\n")
+                append(f"- **链接**: [{pr.html_url}]({pr.html_url})\n")
+
+                if not compact_mode and pr.body:
+                    append(f"- **描述**: {pr.body}\n")
+
+                append("\n")
         else:
-            content += f"无{'已合并' if compact_mode else ''}的 Pull Requests\n\n"
+            append(f"无{'已合并' if compact_mode else ''}的 Pull Requests\n\n")
 
-        content += f"""---
+        append(f"""---
 
 ## 🐛 Issues {f'(已关闭)' if compact_mode else ''}
 
-"""
+""")
 
         if issues:
             for issue in issues:
-                status_icon = "✅" if issue['state'] == 'closed' else "🔴"
-                labels_info = f" 🏷️ {', '.join(issue['labels'])}" if issue.get('labels') else ""
-
-                content += f"### {status_icon} #{issue['number']} {issue['title']}{labels_info}\n\n"
-                content += f"- **作者**: {issue['user']}\n"
-                content += f"- **状态**: {issue['state']}\n"
-                content += f"- **创建时间**: {issue['created_at']}\n"
-                content += f"- **更新时间**: {issue['updated_at']}\n"
-                content += f"- **链接**: [{issue['html_url']}]({issue['html_url']})\n"
-
-                if not compact_mode and issue.get('body'):
-                    content += f"- **描述**: {issue['body']}\n"
-
-                content += "\n"
+                status_icon = "✅" if issue.state == 'closed' else "🔴"
+                labels_info = f" 🏷️ {', '.join(issue.labels)}" if issue.labels else ""
+
+                append(
+                    f"### {status_icon} #{issue.number} {issue.title}{labels_info}\n\n"
+                    f"- **作者**: {issue.user}\n"
+                    f"- **状态**: {issue.state}\n"
+                    f"- **创建时间**: {issue.created_at}\n"
+                    f"- **更新时间**: {issue.updated_at}\n"
+                    f"- **链接**: [{issue.html_url}]({issue.html_url})\n"
+                )
+
+                if not compact_mode and issue.body:
+                    append(f"- **描述**: {issue.body}\n")
+
+                append("\n")
         else:
-            content += f"无{'已关闭' if compact_mode else ''}的 Issues\n\n"
+            append(f"无{'已关闭' if compact_mode else ''}的 Issues\n\n")
 
-        content += """---
+        append("""---
 
 ## 📈 统计信息
 
-"""
+""")
         if compact_mode:
-            content += f"- 已合并 PR: {len(pull_requests)}\n"
-            content += f"- 已关闭 Issues: {len(issues)}\n"
+            append(
+                f"- 已合并 PR: {len(pull_requests)}\n"
+                f"- 已关闭 Issues: {len(issues)}\n"
+            )
         else:
             # 完整模式的统计
-            merged_prs = len([pr for pr in pull_requests if pr.get('merged_at')])
-            open_prs = len([pr for pr in pull_requests if pr['state'] == 'open'])
-            closed_prs = len([pr for pr in pull_requests if pr['state'] == 'closed' and not pr.get('merged_at')])
-
-            open_issues = len([issue for issue in issues if issue['state'] == 'open'])
-            closed_issues = len([issue for issue in issues if issue['state'] == 'closed'])
-
-            content += f"- 已合并 PR: {merged_prs}\n"
-            content += f"- 开放 PR: {open_prs}\n"
-            content += f"- 已关闭 PR: {closed_prs}\n"
-            content += f"- 开放 Issues: {open_issues}\n"
-            content += f"- 已关闭 Issues: {closed_issues}\n"
+            merged_prs = len([pr for pr in pull_requests if pr.merged_at])
+            open_prs = len([pr for pr in pull_requests if pr.state == 'open'])
+            closed_prs = len([pr for pr in pull_requests if pr.state == 'closed' and not pr.merged_at])
+
+            open_issues = len([issue for issue in issues if issue.state == 'open'])
+            closed_issues = len([issue for issue in issues if issue.state == 'closed'])
+
+            append(
+                f"- 已合并 PR: {merged_prs}\n"
+                f"- 开放 PR: {open_prs}\n"
+                f"- 已关闭 PR: {closed_prs}\n"
+                f"- 开放 Issues: {open_issues}\n"
+                f"- 已关闭 Issues: {closed_issues}\n"
+            )
 
-        content += f"\n**报告生成工具**: GitHub Sentinel v0.2\n"
+        append("\n**报告生成工具**: GitHub Sentinel v0.2\n")
 
-        return content
+        return "".join(parts)
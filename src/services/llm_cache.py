@@ -0,0 +1,95 @@
+"""
+LLM 响应缓存 - 相同的提供商、模型、消息和生成参数直接返回已缓存的回复
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def default_cache_path() -> Path:
+    """默认缓存文件路径（遵循 XDG_CACHE_HOME）"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "github-sentinel" / "llm-cache.db"
+
+
+# 缓存条目的默认有效期（秒）；过期后重新调用LLM
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+class LLMResponseCache:
+    """基于 SQLite 的 LLM 响应缓存
+
+    条目写入超过 max_age 秒后视为过期（None 表示永不过期）；
+    需要立即获取新回复时使用 --no-cache。
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_age: Optional[float] = DEFAULT_MAX_AGE):
+        self.db_path = Path(db_path) if db_path else default_cache_path()
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """首次使用时打开数据库并建表"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path))
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key BLOB PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+            )
+        return self._conn
+
+    @staticmethod
+    def make_key(provider_name: str, model_name: str,
+                 messages: List[Dict[str, str]], params: Dict[str, Any]) -> bytes:
+        """由提供商、模型、消息内容和生成参数计算缓存键"""
+        payload = json.dumps(
+            [provider_name, model_name, messages, params],
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=32).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """读取缓存，未命中或已过期返回 None"""
+        min_created = int(time.time() - self.max_age) if self.max_age is not None else 0
+        try:
+            row = self._connect().execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND created_at >= ?", (key, min_created)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"读取LLM缓存失败: {e}")
+            return None
+        return row[0] if row else None
+
+    def set(self, key: bytes, response: str):
+        """写入缓存，并顺带清理已过期的条目"""
+        now = int(time.time())
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, now)
+            )
+            if self.max_age is not None:
+                conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (int(now - self.max_age),))
+            conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"写入LLM缓存失败: {e}")
+
+    def clear(self):
+        """清空缓存"""
+        conn = self._connect()
+        conn.execute("DELETE FROM llm_cache")
+        conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -6,9 +6,13 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+from functools import lru_cache
 import json
+import os
 from pathlib import Path
 
+from .llm_cache import LLMResponseCache
+
 try:
     from openai import AsyncAzureOpenAI
     AZURE_OPENAI_AVAILABLE = True
@@ -22,9 +26,28 @@ except ImportError:
     OPENAI_AVAILABLE = False
 
 
+@lru_cache(maxsize=32)
+def _read_template(template_path: str, mtime_ns: int) -> str:
+    """读取模板内容；以修改时间为键，文件被修改后自动重新读取"""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def load_template(template_path: str) -> str:
+    """加载提示词模板（进程内缓存，批量/对比报告只读取一次）"""
+    try:
+        mtime_ns = os.stat(template_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"模板文件不存在: {template_path}") from None
+    return _read_template(template_path, mtime_ns)
+
+
 class BaseLLMProvider(ABC):
     """LLM 提供商基类"""
 
+    # 是否支持异步批处理接口（Batch API）
+    supports_batch = False
+
     def __init__(self, model_name: str, **kwargs):
         self.model_name = model_name
         self.logger = logging.getLogger(__name__)
@@ -48,16 +71,19 @@ class AzureOpenAIProvider(BaseLLMProvider):
                  api_key: str,
                  azure_endpoint: str,
                  api_version: str = "2024-02-15-preview",
+                 http_client=None,
                  **kwargs):
         super().__init__(model_name, **kwargs)
 
         if not AZURE_OPENAI_AVAILABLE:
             raise ImportError("请安装 openai 包: pip install openai")
 
+        # http_client 为共享的 httpx.AsyncClient 时，多个提供商复用同一连接池
         self.client = AsyncAzureOpenAI(
             api_key=api_key,
             azure_endpoint=azure_endpoint,
-            api_version=api_version
+            api_version=api_version,
+            http_client=http_client
         )
 
     async def generate_completion(self, prompt: str, **kwargs) -> str:
@@ -98,16 +124,19 @@ class AzureOpenAIProvider(BaseLLMProvider):
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI 提供商"""
 
+    supports_batch = True
+
     def __init__(self,
                  model_name: str,
                  api_key: str,
+                 http_client=None,
                  **kwargs):
         super().__init__(model_name, **kwargs)
 
         if not OPENAI_AVAILABLE:
             raise ImportError("请安装 openai 包: pip install openai")
 
-        self.client = openai.AsyncOpenAI(api_key=api_key)
+        self.client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client)
 
     async def generate_completion(self, prompt: str, **kwargs) -> str:
         """生成文本完成"""
@@ -143,13 +172,71 @@ class OpenAIProvider(BaseLLMProvider):
             self.logger.error(f"OpenAI chat completion 生成失败: {str(e)}")
             raise
 
+    async def run_batch_chat_completions(self,
+                                         requests: Dict[str, List[Dict[str, str]]],
+                                         poll_interval: float = 5.0,
+                                         max_poll_interval: float = 60.0,
+                                         **kwargs) -> Dict[str, str]:
+        """通过 Batch API 提交一批对话请求，等待完成后返回 {custom_id: 回复内容}
+
+        Batch API 费用约为同步调用的一半，但最长可能需要24小时完成。
+        """
+        lines = []
+        for custom_id, messages in requests.items():
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model_name,
+                    "messages": messages,
+                    "max_tokens": kwargs.get('max_tokens', 8000),
+                    "temperature": kwargs.get('temperature', 0.7),
+                }
+            }, ensure_ascii=False))
+        payload = ("\n".join(lines) + "\n").encode('utf-8')
+
+        input_file = await self.client.files.create(
+            file=("batch_requests.jsonl", payload),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        self.logger.info(f"已提交 OpenAI 批处理任务 {batch.id}，共 {len(lines)} 个请求")
+
+        # 指数退避轮询任务状态
+        interval = poll_interval
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, max_poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"OpenAI 批处理任务 {batch.id} 未完成: {batch.status}")
+
+        content = await self.client.files.content(batch.output_file_id)
+        results = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") == 200:
+                results[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"].strip()
+        return results
+
 
 class LLMService:
     """LLM 服务管理类"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[LLMResponseCache] = None):
         self.providers: Dict[str, BaseLLMProvider] = {}
         self.default_provider = None
+        # 可选的响应缓存，相同请求不再重复调用LLM
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
 
     def add_provider(self, name: str, provider: BaseLLMProvider, is_default: bool = False):
@@ -172,27 +259,28 @@ class LLMService:
         return await provider.generate_completion(prompt, **kwargs)
 
     async def generate_chat(self, messages: List[Dict[str, str]],
-                           provider_name: Optional[str] = None, **kwargs) -> str:
-        """生成对话"""
+                           provider_name: Optional[str] = None, use_cache: bool = True,
+                           **kwargs) -> str:
+        """生成对话（use_cache=False 时绕过响应缓存，直接调用提供商）"""
         provider = self.get_provider(provider_name)
-        return await provider.generate_chat_completion(messages, **kwargs)
+        if self.cache is None or not use_cache:
+            return await provider.generate_chat_completion(messages, **kwargs)
 
-    async def generate_report_from_template(self,
-                                          template_path: str,
-                                          markdown_content: str,
-                                          provider_name: Optional[str] = None,
-                                          **kwargs) -> str:
-        """使用模板生成报告"""
-        # 读取模板
-        template_file = Path(template_path)
-        if not template_file.exists():
-            raise FileNotFoundError(f"模板文件不存在: {template_path}")
+        key = self.cache.make_key(provider_name or self.default_provider, provider.model_name, messages, kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.logger.info(f"命中LLM响应缓存: {provider_name or self.default_provider}")
+            return cached
+
+        response = await provider.generate_chat_completion(messages, **kwargs)
+        self.cache.set(key, response)
+        return response
 
-        with open(template_file, 'r', encoding='utf-8') as f:
-            template = f.read()
+    def _build_template_messages(self, template_path: str, markdown_content: str) -> List[Dict[str, str]]:
+        """读取模板并构建对话消息"""
+        template = load_template(template_path)
 
-        # 构建消息
-        messages = [
+        return [
             {
                 "role": "system",
                 "content": template
@@ -203,6 +291,29 @@ class LLMService:
             }
         ]
 
+    def _save_summary_report(self, repo_name: str, report_content: str, output_dir: str) -> str:
+        """保存摘要报告，返回文件路径"""
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{repo_name}_summary_{timestamp}.md"
+        filepath = output_path / filename
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(report_content)
+
+        self.logger.info(f"摘要报告已生成: {filepath}")
+        return str(filepath)
+
+    async def generate_report_from_template(self,
+                                          template_path: str,
+                                          markdown_content: str,
+                                          provider_name: Optional[str] = None,
+                                          **kwargs) -> str:
+        """使用模板生成报告"""
+        messages = self._build_template_messages(template_path, markdown_content)
+
         # 生成报告
         return await self.generate_chat(messages, provider_name, **kwargs)
 
@@ -223,18 +334,40 @@ class LLMService:
         )
 
         # 保存报告
-        output_path = Path(output_dir)
-        output_path.mkdir(exist_ok=True)
+        return self._save_summary_report(repo_name, report_content, output_dir)
+
+    def supports_batch(self, provider_name: Optional[str] = None) -> bool:
+        """提供商是否支持 Batch API"""
+        return self.get_provider(provider_name).supports_batch
+
+    async def generate_summary_reports_batch(self,
+                                             items: List[Dict[str, str]],
+                                             template_name: str = "github_azure_prompt.txt",
+                                             provider_name: Optional[str] = None,
+                                             output_dir: str = "daily_progress",
+                                             **kwargs) -> Dict[str, str]:
+        """通过提供商的 Batch API 批量生成摘要报告
+
+        items 为 [{'key': ..., 'repo_name': ..., 'markdown_content': ...}]，
+        返回 {key: 报告文件路径}，未成功的条目不在结果中。
+        """
+        provider = self.get_provider(provider_name)
+        if not provider.supports_batch:
+            raise ValueError(f"LLM 提供商不支持批处理接口: {provider_name or self.default_provider}")
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{repo_name}_summary_{timestamp}.md"
-        filepath = output_path / filename
+        template_path = str(Path("prompts") / template_name)
+        requests = {
+            item['key']: self._build_template_messages(template_path, item['markdown_content'])
+            for item in items
+        }
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        contents = await provider.run_batch_chat_completions(requests, **kwargs)
 
-        self.logger.info(f"摘要报告已生成: {filepath}")
-        return str(filepath)
+        return {
+            item['key']: self._save_summary_report(item['repo_name'], contents[item['key']], output_dir)
+            for item in items
+            if item['key'] in contents
+        }
 
     def list_providers(self) -> List[str]:
         """列出所有可用的提供商"""
@@ -260,7 +393,8 @@ def create_azure_openai_provider(config: Dict[str, Any]) -> AzureOpenAIProvider:
         model_name=config['model_name'],
         api_key=config['api_key'],
         azure_endpoint=config['azure_endpoint'],
-        api_version=config.get('api_version', '2024-02-15-preview')
+        api_version=config.get('api_version', '2024-02-15-preview'),
+        http_client=config.get('http_client')
     )
 
 
@@ -268,5 +402,6 @@ def create_openai_provider(config: Dict[str, Any]) -> OpenAIProvider:
     """创建 OpenAI 提供商"""
     return OpenAIProvider(
         model_name=config['model_name'],
-        api_key=config['api_key']
+        api_key=config['api_key'],
+        http_client=config.get('http_client')
     )
@@ -4,9 +4,10 @@
 import aiohttp
 import asyncio
 import smtplib
+from contextlib import asynccontextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 import json
 
@@ -19,10 +20,23 @@ from ..config.settings import Settings
 class NotificationService:
     """通知服务"""
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, session: Optional[aiohttp.ClientSession] = None):
         self.settings = settings
+        # 可选的共享HTTP会话（由调用方创建和关闭），未提供时每次发送临时创建
+        self.session = session
         self.logger = logging.getLogger(__name__)
 
+    @asynccontextmanager
+    async def _post(self, url: str, **kwargs):
+        """发送POST请求，优先复用共享会话"""
+        if self.session is not None and not self.session.closed:
+            async with self.session.post(url, **kwargs) as response:
+                yield response
+        else:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, **kwargs) as response:
+                    yield response
+
     async def send_notifications(self, report: Report, subscriptions: List[Subscription]):
         """发送通知"""
         if not report.updates:
@@ -138,16 +152,15 @@ class NotificationService:
             # 创建Slack消息格式
             slack_message = self._format_slack_message(report)
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    webhook_url,
-                    json=slack_message,
-                    timeout=aiohttp.ClientTimeout(total=self.settings.notification.webhook_timeout)
-                ) as response:
-                    if response.status == 200:
-                        self.logger.info("Slack通知发送成功")
-                    else:
-                        self.logger.error(f"Slack通知发送失败: {response.status}")
+            async with self._post(
+                webhook_url,
+                json=slack_message,
+                timeout=aiohttp.ClientTimeout(total=self.settings.notification.webhook_timeout)
+            ) as response:
+                if response.status == 200:
+                    self.logger.info("Slack通知发送成功")
+                else:
+                    self.logger.error(f"Slack通知发送失败: {response.status}")
 
         except Exception as e:
             self.logger.error(f"发送Slack通知失败: {e}")
@@ -208,16 +221,15 @@ class NotificationService:
             # 创建Discord消息格式
             discord_message = self._format_discord_message(report)
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    webhook_url,
-                    json=discord_message,
-                    timeout=aiohttp.ClientTimeout(total=self.settings.notification.webhook_timeout)
-                ) as response:
-                    if response.status == 204:  # Discord返回204表示成功
-                        self.logger.info("Discord通知发送成功")
-                    else:
-                        self.logger.error(f"Discord通知发送失败: {response.status}")
+            async with self._post(
+                webhook_url,
+                json=discord_message,
+                timeout=aiohttp.ClientTimeout(total=self.settings.notification.webhook_timeout)
+            ) as response:
+                if response.status == 204:  # Discord返回204表示成功
+                    self.logger.info("Discord通知发送成功")
+                else:
+                    self.logger.error(f"Discord通知发送失败: {response.status}")
 
         except Exception as e:
             self.logger.error(f"发送Discord通知失败: {e}")
@@ -294,16 +306,15 @@ class NotificationService:
     async def _send_single_webhook(self, webhook_url: str, payload: Dict[str, Any]):
         """发送单个webhook"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    webhook_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.settings.notification.webhook_timeout)
-                ) as response:
-                    if 200 <= response.status < 300:
-                        self.logger.debug(f"Webhook发送成功: {webhook_url}")
-                    else:
-                        self.logger.error(f"Webhook发送失败 {webhook_url}: {response.status}")
+            async with self._post(
+                webhook_url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=self.settings.notification.webhook_timeout)
+            ) as response:
+                if 200 <= response.status < 300:
+                    self.logger.debug(f"Webhook发送成功: {webhook_url}")
+                else:
+                    self.logger.error(f"Webhook发送失败 {webhook_url}: {response.status}")
 
         except Exception as e:
             self.logger.error(f"发送Webhook失败 {webhook_url}: {e}")
@@ -340,17 +351,15 @@ class NotificationService:
                 webhook_url = config.get('webhook_url')
                 if webhook_url:
                     message = self._format_slack_message(test_report)
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(webhook_url, json=message) as response:
-                            return response.status == 200
+                    async with self._post(webhook_url, json=message) as response:
+                        return response.status == 200
 
             elif notification_type == NotificationType.DISCORD:
                 webhook_url = config.get('webhook_url')
                 if webhook_url:
                     message = self._format_discord_message(test_report)
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(webhook_url, json=message) as response:
-                            return response.status == 204
+                    async with self._post(webhook_url, json=message) as response:
+                        return response.status == 204
 
             return False
 
@@ -1,8 +1,9 @@
 """
 报告生成服务
 """
+import asyncio
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Callable, List, Dict, Optional
 from pathlib import Path
 import json
 import logging
@@ -48,6 +49,18 @@ class ReportService:
             self.logger.error(f"生成每日进展报告失败: {str(e)}")
             raise
 
+    def _read_progress_content(self, progress_file: str) -> str:
+        """读取进展文件内容，过长时截断以节省token"""
+        with open(progress_file, 'r', encoding='utf-8') as f:
+            progress_content = f.read()
+
+        # 检查内容长度，如果太长则截断
+        if len(progress_content) > 4000:  # 约1000个token
+            self.logger.warning(f"进展内容过长({len(progress_content)}字符)，将截断以节省token")
+            progress_content = progress_content[:4000] + "\n\n[内容已截断以节省token]"
+
+        return progress_content
+
     async def generate_llm_summary_report(self,
                                          repo: str,
                                          progress_file: str,
@@ -57,14 +70,7 @@ class ReportService:
                                          **llm_kwargs) -> str:
         """使用LLM生成摘要报告"""
         try:
-            # 读取进展文件内容
-            with open(progress_file, 'r', encoding='utf-8') as f:
-                progress_content = f.read()
-
-            # 检查内容长度，如果太长则截断
-            if len(progress_content) > 4000:  # 约1000个token
-                self.logger.warning(f"进展内容过长({len(progress_content)}字符)，将截断以节省token")
-                progress_content = progress_content[:4000] + "\n\n[内容已截断以节省token]"
+            progress_content = self._read_progress_content(progress_file)
 
             # 使用LLM生成摘要报告，设置较小的max_tokens
             summary_file = await self.llm_service.generate_summary_report(
@@ -120,14 +126,98 @@ class ReportService:
             self.logger.error(f"生成完整每日报告失败: {str(e)}")
             raise
 
+    def _schedule_batch_reports(self,
+                                repositories: List[Dict[str, str]],
+                                template_name: str,
+                                provider_name: Optional[str],
+                                concurrency: int,
+                                **llm_kwargs) -> List[asyncio.Task]:
+        """为每个有效仓库创建报告生成任务，并发数由信号量限制"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def generate_one(owner: str, repo: str) -> Dict[str, str]:
+            async with semaphore:
+                try:
+                    result = await self.generate_complete_daily_report(
+                        owner, repo, template_name=template_name, provider_name=provider_name, **llm_kwargs
+                    )
+                    self.logger.info(f"已完成 {owner}/{repo} 的报告生成")
+                    return result
+                except Exception as e:
+                    self.logger.error(f"生成 {owner}/{repo} 报告失败: {str(e)}")
+                    return {
+                        "repository": f"{owner}/{repo}",
+                        "error": str(e),
+                        "generated_at": datetime.now().isoformat()
+                    }
+
+        tasks = []
+        for repo_info in repositories:
+            owner = repo_info.get('owner')
+            repo = repo_info.get('repo')
+
+            if not owner or not repo:
+                self.logger.warning(f"跳过无效的仓库信息: {repo_info}")
+                continue
+
+            tasks.append(asyncio.ensure_future(generate_one(owner, repo)))
+        return tasks
+
+    async def iter_batch_reports(self,
+                                 repositories: List[Dict[str, str]],
+                                 template_name: str = "github_azure_prompt.txt",
+                                 provider_name: Optional[str] = None,
+                                 concurrency: int = 3,
+                                 on_progress: Optional[Callable[[int, int, Dict[str, str]], None]] = None,
+                                 **llm_kwargs) -> AsyncIterator[Dict[str, str]]:
+        """批量生成报告，按完成顺序逐个产出结果
+
+        on_progress(已完成数, 总数, 结果) 在每个仓库完成时调用。
+        """
+        tasks = self._schedule_batch_reports(
+            repositories, template_name, provider_name, concurrency, **llm_kwargs
+        )
+        done = 0
+        try:
+            for future in asyncio.as_completed(tasks):
+                result = await future
+                done += 1
+                if on_progress:
+                    on_progress(done, len(tasks), result)
+                yield result
+        finally:
+            # 调用方提前退出时取消未完成的任务，已完成的报告文件保留
+            for task in tasks:
+                task.cancel()
+
     async def batch_generate_reports(self,
                                    repositories: List[Dict[str, str]],
                                    template_name: str = "github_azure_prompt.txt",
                                    provider_name: Optional[str] = None,
+                                   concurrency: int = 1,
                                    **llm_kwargs) -> List[Dict[str, str]]:
-        """批量生成多个仓库的报告"""
+        """批量生成多个仓库的报告，结果顺序与输入一致"""
+        tasks = self._schedule_batch_reports(
+            repositories, template_name, provider_name, concurrency, **llm_kwargs
+        )
+        try:
+            return [await task for task in tasks]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def batch_generate_reports_via_api(self,
+                                             repositories: List[Dict[str, str]],
+                                             template_name: str = "github_azure_prompt.txt",
+                                             provider_name: Optional[str] = None,
+                                             compact_mode: bool = True,
+                                             **llm_kwargs) -> List[Dict[str, str]]:
+        """批量生成报告，LLM摘要通过提供商的 Batch API 一次性提交"""
         results = []
+        items = []
+        progress_files = {}
 
+        # 1. 逐个生成原始进展报告
         for repo_info in repositories:
             owner = repo_info.get('owner')
             repo = repo_info.get('repo')
@@ -136,44 +226,101 @@ class ReportService:
                 self.logger.warning(f"跳过无效的仓库信息: {repo_info}")
                 continue
 
+            full_name = f"{owner}/{repo}"
             try:
-                result = await self.generate_complete_daily_report(
-                    owner, repo, template_name, provider_name, **llm_kwargs
+                progress_file = await self.generate_daily_progress_report(
+                    owner, repo, compact_mode=compact_mode
                 )
-                results.append(result)
-                self.logger.info(f"已完成 {owner}/{repo} 的报告生成")
-
+                progress_files[full_name] = progress_file
+                items.append({
+                    'key': full_name,
+                    'repo_name': repo,
+                    'markdown_content': self._read_progress_content(progress_file)
+                })
             except Exception as e:
-                self.logger.error(f"生成 {owner}/{repo} 报告失败: {str(e)}")
                 results.append({
-                    "repository": f"{owner}/{repo}",
+                    "repository": full_name,
                     "error": str(e),
                     "generated_at": datetime.now().isoformat()
                 })
 
+        if not items:
+            return results
+
+        # 2. 一次提交全部摘要请求
+        summaries = await self.llm_service.generate_summary_reports_batch(
+            items,
+            template_name=template_name,
+            provider_name=provider_name,
+            output_dir=str(self.daily_progress_dir),
+            **llm_kwargs
+        )
+
+        for item in items:
+            full_name = item['key']
+            if full_name in summaries:
+                results.append({
+                    "progress_report": progress_files[full_name],
+                    "summary_report": summaries[full_name],
+                    "repository": full_name,
+                    "generated_at": datetime.now().isoformat(),
+                    "mode": "compact" if compact_mode else "full"
+                })
+            else:
+                results.append({
+                    "repository": full_name,
+                    "error": "批处理任务未返回该仓库的结果",
+                    "generated_at": datetime.now().isoformat()
+                })
+
         return results
 
     async def generate_report_with_multiple_templates(self,
                                                     owner: str,
                                                     repo: str,
                                                     templates: List[str],
-                                                    provider_name: Optional[str] = None) -> Dict[str, str]:
-        """使用多个模板生成对比报告"""
+                                                    providers: Optional[List[str]] = None,
+                                                    per_provider_concurrency: int = 3,
+                                                    on_result: Optional[Callable[[Dict[str, str]], None]] = None
+                                                    ) -> Dict:
+        """使用多个模板和多个提供商生成对比报告
+
+        模板 × 提供商的组合并发生成，每个提供商的并发数单独限制；
+        on_result(结果) 在每个组合完成时调用。
+        """
         try:
-            # 先生成原始进展报告（使用紧凑模式节省token）
+            # 先生成原始进展报告（使用紧凑模式节省token），所有组合共用
             progress_file = await self.generate_daily_progress_report(
                 owner, repo, compact_mode=True
             )
 
-            summaries = {}
-            for template in templates:
-                try:
-                    summary_file = await self.generate_llm_summary_report(
-                        repo, progress_file, template, provider_name, max_tokens=1200
-                    )
-                    summaries[template] = summary_file
-                except Exception as e:
-                    summaries[template] = f"ERROR: {str(e)}"
+            provider_names = providers or [None]  # None 表示默认提供商
+            semaphores = {
+                name: asyncio.Semaphore(max(1, per_provider_concurrency)) for name in provider_names
+            }
+
+            async def generate_one(template: str, provider_name: Optional[str]) -> Dict[str, str]:
+                result = {"template": template, "provider": provider_name or "default"}
+                # 文件名带上模板和提供商，并发生成时互不覆盖
+                label = f"{repo}_{Path(template).stem}"
+                if provider_name:
+                    label += f"_{provider_name}"
+                async with semaphores[provider_name]:
+                    try:
+                        result["summary_file"] = await self.generate_llm_summary_report(
+                            label, progress_file, template, provider_name, max_tokens=1200
+                        )
+                    except Exception as e:
+                        result["error"] = str(e)
+                if on_result:
+                    on_result(result)
+                return result
+
+            summaries = await asyncio.gather(*(
+                generate_one(template, provider_name)
+                for template in templates
+                for provider_name in provider_names
+            ))
 
             return {
                 "progress_report": progress_file,
@@ -236,7 +383,6 @@ class ReportService:
         filename = f"daily_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         filepath = self.reports_dir / filename
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+        filepath.write_bytes(report.to_json_bytes(indent=True))
 
         self.logger.info(f"报告已保存到: {filepath}")
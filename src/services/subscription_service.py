@@ -3,20 +3,34 @@
 """
 import json
 import os
+import time
 from datetime import datetime
-from typing import List, Optional
+from enum import Enum
+from typing import List, Optional, Tuple
 from pathlib import Path
 
 from ..models.subscription import Subscription
 from ..config.settings import Settings
 
 
+class AddResult(Enum):
+    """添加订阅的结果"""
+    ADDED = "added"
+    ALREADY_EXISTS = "already_exists"
+    ERROR = "error"
+
+
 class SubscriptionService:
     """订阅管理服务"""
 
+    # 统计信息缓存时间（秒），订阅变更时立即失效
+    STATS_CACHE_TTL = 30
+
     def __init__(self, settings: Settings):
         self.settings = settings
         self.data_file = Path(settings.database.path)
+        # (过期时间, 统计信息)，使用单调时钟
+        self._stats_cache: Optional[Tuple[float, dict]] = None
         self._ensure_data_file_exists()
 
     def _ensure_data_file_exists(self):
@@ -38,6 +52,7 @@ class SubscriptionService:
     def _save_subscriptions(self, subscriptions: List[Subscription]):
         """保存所有订阅"""
         try:
+            self._stats_cache = None
             data = [sub.to_dict() for sub in subscriptions]
             with open(self.data_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
@@ -62,7 +77,7 @@ class SubscriptionService:
                 return sub
         return None
 
-    async def add_subscription(self, subscription: Subscription) -> bool:
+    async def add_subscription(self, subscription: Subscription) -> AddResult:
         """添加新订阅"""
         try:
             subscriptions = self._load_subscriptions()
@@ -73,16 +88,16 @@ class SubscriptionService:
                     existing.repo_name == subscription.repo_name and
                     existing.is_active):
                     print(f"仓库 {subscription.owner}/{subscription.repo_name} 已存在活跃订阅")
-                    return False
+                    return AddResult.ALREADY_EXISTS
 
             subscriptions.append(subscription)
             self._save_subscriptions(subscriptions)
             print(f"成功添加订阅: {subscription.owner}/{subscription.repo_name}")
-            return True
+            return AddResult.ADDED
 
         except Exception as e:
             print(f"添加订阅失败: {e}")
-            return False
+            return AddResult.ERROR
 
     async def update_subscription(self, subscription: Subscription) -> bool:
         """更新订阅"""
@@ -173,6 +188,10 @@ class SubscriptionService:
 
     async def get_subscription_stats(self) -> dict:
         """获取订阅统计信息"""
+        now = time.monotonic()
+        if self._stats_cache is not None and now < self._stats_cache[0]:
+            return self._stats_cache[1]
+
         subscriptions = self._load_subscriptions()
         active_subs = [sub for sub in subscriptions if sub.is_active]
 
@@ -188,10 +207,12 @@ class SubscriptionService:
             for nt in sub.notification_types:
                 notification_stats[nt.value] = notification_stats.get(nt.value, 0) + 1
 
-        return {
+        stats = {
             'total_subscriptions': len(subscriptions),
             'active_subscriptions': len(active_subs),
             'inactive_subscriptions': len(subscriptions) - len(active_subs),
             'frequency_distribution': frequency_stats,
             'notification_type_distribution': notification_stats
         }
+        self._stats_cache = (now + self.STATS_CACHE_TTL, stats)
+        return stats
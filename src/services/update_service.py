@@ -2,8 +2,9 @@
 更新获取服务
 """
 import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 import logging
 
 from ..models.subscription import Subscription, UpdateType
@@ -15,22 +16,41 @@ from ..config.settings import Settings
 class UpdateService:
     """更新获取服务"""
 
-    def __init__(self, settings: Settings):
+    # 速率限制状态缓存时间（秒）
+    RATE_LIMIT_CACHE_TTL = 30
+
+    def __init__(self, settings: Settings, github_service: Optional[GitHubService] = None):
         self.settings = settings
-        self.github_service = GitHubService(
+        # 允许传入已有的 GitHubService，与其他服务共用同一连接池
+        self.github_service = github_service or GitHubService(
             token=settings.github.token,
             rate_limit_per_hour=settings.github.rate_limit_per_hour,
             timeout=settings.github.timeout
         )
         self.logger = logging.getLogger(__name__)
+        # (过期时间, 状态)，使用单调时钟
+        self._rate_limit_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+    async def close(self):
+        """释放底层HTTP连接"""
+        await self.github_service.close()
 
     async def fetch_updates(self, subscriptions: List[Subscription], days: int = 1) -> List[RepositoryUpdate]:
         """获取订阅的更新"""
+        all_updates = [update async for update in self.iter_updates(subscriptions, days=days)]
+
+        # 按时间排序
+        all_updates.sort(key=lambda x: x.created_at, reverse=True)
+
+        self.logger.info(f"共获取到 {len(all_updates)} 个更新")
+        return all_updates
+
+    async def iter_updates(self, subscriptions: List[Subscription], days: int = 1) -> AsyncIterator[RepositoryUpdate]:
+        """逐个产出订阅的更新，哪个仓库先返回就先产出哪个仓库的结果"""
         if not subscriptions:
-            return []
+            return
 
         since = datetime.now() - timedelta(days=days)
-        all_updates = []
 
         # 使用信号量控制并发请求数
         semaphore = asyncio.Semaphore(self.settings.max_concurrent_requests)
@@ -44,26 +64,19 @@ class UpdateService:
                     self.logger.error(f"获取仓库更新失败 {sub.owner}/{sub.repo_name}: {e}")
                     return []
 
-        # 并发获取所有订阅的更新
-        tasks = [fetch_repo_updates(sub) for sub in subscriptions]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # 合并结果
-        for result in results:
-            if isinstance(result, list):
-                all_updates.extend(result)
-            elif isinstance(result, Exception):
-                self.logger.error(f"获取更新时出现异常: {result}")
-
-        # 按时间排序
-        all_updates.sort(key=lambda x: x.created_at, reverse=True)
-
-        self.logger.info(f"共获取到 {len(all_updates)} 个更新")
-        return all_updates
+        # 并发获取所有订阅的更新，按完成顺序产出
+        tasks = [asyncio.ensure_future(fetch_repo_updates(sub)) for sub in subscriptions]
+        try:
+            for future in asyncio.as_completed(tasks):
+                for update in await future:
+                    yield update
+        finally:
+            # 调用方提前退出迭代时取消尚未完成的请求
+            for task in tasks:
+                task.cancel()
 
     async def _fetch_single_repo_updates(self, subscription: Subscription, since: datetime) -> List[RepositoryUpdate]:
         """获取单个仓库的更新"""
-        updates = []
         owner = subscription.owner
         repo = subscription.repo_name
 
@@ -71,44 +84,16 @@ class UpdateService:
         effective_since = subscription.last_checked or since
 
         try:
-            # 根据订阅的更新类型获取不同类型的更新
+            # 根据订阅的更新类型并发获取不同类型的更新
             update_types = subscription.update_types
-
-            if UpdateType.ALL in update_types:
-                # 获取所有类型的更新
-                commits = await self.github_service.get_recent_commits(owner, repo, effective_since)
-                issues = await self.github_service.get_recent_issues(owner, repo, effective_since)
-                prs = await self.github_service.get_recent_pull_requests(owner, repo, effective_since)
-                releases = await self.github_service.get_recent_releases(owner, repo, effective_since)
-
-                updates.extend(commits)
-                updates.extend(issues)
-                updates.extend(prs)
-                updates.extend(releases)
-
-            else:
-                # 根据指定的类型获取更新
-                if UpdateType.COMMITS in update_types:
-                    commits = await self.github_service.get_recent_commits(owner, repo, effective_since)
-                    updates.extend(commits)
-
-                if UpdateType.ISSUES in update_types:
-                    issues = await self.github_service.get_recent_issues(owner, repo, effective_since)
-                    updates.extend(issues)
-
-                if UpdateType.PULL_REQUESTS in update_types:
-                    prs = await self.github_service.get_recent_pull_requests(owner, repo, effective_since)
-                    updates.extend(prs)
-
-                if UpdateType.RELEASES in update_types:
-                    releases = await self.github_service.get_recent_releases(owner, repo, effective_since)
-                    updates.extend(releases)
+            types = None if UpdateType.ALL in update_types else {t.value for t in update_types}
+            updates = await self.github_service.get_all_updates(owner, repo, effective_since, types)
 
             # 应用过滤器
             if subscription.filters:
                 updates = self._apply_filters(updates, subscription.filters)
 
-            self.logger.info(f"仓库 {owner}/{repo} 获取到 {len(updates)} 个更新")
+            self.logger.info("仓库 %s/%s 获取到 %d 个更新", owner, repo, len(updates))
             return updates
 
         except Exception as e:
@@ -153,7 +138,8 @@ class UpdateService:
                 allowed_types = set(filters['update_types'])
                 filtered_updates = [u for u in filtered_updates if u.update_type in allowed_types]
 
-            self.logger.debug(f"过滤器应用完成，从 {len(updates)} 个更新过滤到 {len(filtered_updates)} 个")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("过滤器应用完成，从 %d 个更新过滤到 %d 个", len(updates), len(filtered_updates))
 
         except Exception as e:
             self.logger.error(f"应用过滤器失败: {e}")
@@ -188,8 +174,14 @@ class UpdateService:
 
     async def get_api_rate_limit_status(self) -> Dict[str, Any]:
         """获取API速率限制状态"""
+        now = time.monotonic()
+        if self._rate_limit_cache is not None and now < self._rate_limit_cache[0]:
+            return self._rate_limit_cache[1]
+
         try:
-            return await self.github_service.get_rate_limit_status()
+            status = await self.github_service.get_rate_limit_status()
+            self._rate_limit_cache = (now + self.RATE_LIMIT_CACHE_TTL, status)
+            return status
         except Exception as e:
             self.logger.error(f"获取API速率限制状态失败: {e}")
             return {}
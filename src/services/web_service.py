@@ -14,8 +14,10 @@ except ImportError:
     print("请运行: pip install gradio>=4.0.0 pandas")
     raise
 
-from ..models.subscription import Subscription, NotificationType, UpdateFrequency, UpdateType
-from ..services.subscription_service import SubscriptionService
+from ..models.subscription import (
+    Subscription, NOTIFICATION_TYPE_MAP, UPDATE_FREQUENCY_MAP, UPDATE_TYPE_MAP
+)
+from ..services.subscription_service import SubscriptionService, AddResult
 from ..services.report_service import ReportService
 from ..services.update_service import UpdateService
 from ..services.github_service import GitHubService
@@ -66,6 +68,18 @@ class WebService:
 
         self.logger.info("✅ Web服务初始化完成")
 
+    async def close(self):
+        """释放GitHub服务持有的HTTP连接"""
+        await self.github_service.close()
+        await self.update_service.close()
+
+    def _close_loop(self, loop: asyncio.AbstractEventLoop):
+        """在关闭本次调用的事件循环前释放绑定在该循环上的HTTP连接"""
+        try:
+            loop.run_until_complete(self.close())
+        finally:
+            loop.close()
+
     def _setup_llm_providers(self):
         """设置LLM提供商"""
         for provider_config in self.settings.llm_providers:
@@ -446,7 +460,7 @@ github:
                 else:
                     return f"❌ 生成报告时出错: {error_msg}"
             finally:
-                loop.close()
+                self._close_loop(loop)
 
         except Exception as e:
             self.logger.error(f"❌ Web界面处理报告请求时出错: {str(e)}", exc_info=True)
@@ -513,23 +527,26 @@ github:
                 repo_url=repo_url,
                 owner=owner,
                 repo_name=repo_name,
-                notification_types=[NotificationType(nt) for nt in notification_types],
-                frequency=UpdateFrequency(frequency),
-                update_types=[UpdateType(ut) for ut in update_types]
+                notification_types=[NOTIFICATION_TYPE_MAP[nt] for nt in notification_types],
+                frequency=UPDATE_FREQUENCY_MAP[frequency],
+                update_types=[UPDATE_TYPE_MAP[ut] for ut in update_types]
             )
 
             # 异步添加订阅
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            success = loop.run_until_complete(self.subscription_service.add_subscription(subscription))
+            result = loop.run_until_complete(self.subscription_service.add_subscription(subscription))
             loop.close()
 
-            if success:
+            if result is AddResult.ADDED:
                 self.logger.info(f"✅ Web界面成功添加订阅: {owner}/{repo_name}")
                 return f"✅ 成功添加订阅: {owner}/{repo_name}"
+            elif result is AddResult.ALREADY_EXISTS:
+                self.logger.warning(f"⚠️  Web界面添加订阅失败，已存在: {owner}/{repo_name}")
+                return "❌ 添加订阅失败，已存在相同订阅"
             else:
-                self.logger.warning(f"⚠️  Web界面添加订阅失败，可能重复: {owner}/{repo_name}")
-                return "❌ 添加订阅失败，可能已存在相同订阅"
+                self.logger.warning(f"⚠️  Web界面添加订阅失败: {owner}/{repo_name}")
+                return "❌ 添加订阅失败，请查看日志"
 
         except Exception as e:
             self.logger.error(f"❌ Web界面添加订阅时出错: {str(e)}", exc_info=True)
@@ -554,7 +571,8 @@ github:
             for sub in subscriptions:
                 notification_str = ", ".join([nt.value for nt in sub.notification_types])
                 status = "✅ 活跃" if sub.is_active else "❌ 已停用"
-                created_time = sub.created_at.strftime("%Y-%m-%d %H:%M")
+                # isoformat为C实现，比strftime快；截取16位去掉可能的时区后缀
+                created_time = sub.created_at.isoformat(sep=" ", timespec="minutes")[:16]
 
                 data.append([
                     sub.id[:8],  # 显示ID前8位
@@ -606,7 +624,7 @@ github:
 
             subscriptions = loop.run_until_complete(self.subscription_service.get_active_subscriptions())
             if not subscriptions:
-                loop.close()
+                self._close_loop(loop)
                 return "❌ 没有活跃的订阅，无法生成报告"
 
             # 根据报告类型确定天数
@@ -619,7 +637,7 @@ github:
             updates = loop.run_until_complete(self.update_service.fetch_updates(subscriptions, days))
 
             if not updates:
-                loop.close()
+                self._close_loop(loop)
                 return f"📝 在过去{days}天内没有发现新的更新"
 
             # 使用简单的报告生成方法
@@ -634,7 +652,7 @@ github:
             if len(updates) > 10:
                 report_content += f"... 还有 {len(updates) - 10} 个更新\n"
 
-            loop.close()
+            self._close_loop(loop)
             return report_content
 
         except Exception as e:
@@ -680,7 +698,7 @@ github:
             if active_subs:
                 status_info.append("📋 活跃订阅详情:")
                 for sub in active_subs[:5]:  # 显示前5个
-                    last_check = sub.last_checked.strftime('%Y-%m-%d %H:%M') if sub.last_checked else "从未检查"
+                    last_check = sub.last_checked.isoformat(sep=' ', timespec='minutes')[:16] if sub.last_checked else "从未检查"
                     status_info.append(f"  • {sub.owner}/{sub.repo_name} - {sub.frequency.value} - 最后检查: {last_check}")
 
                 if len(active_subs) > 5:
@@ -702,14 +720,16 @@ github:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
 
-            if scan_type == "daily":
-                loop.run_until_complete(sentinel.run_daily_scan())
-                result = "✅ 每日扫描已完成"
-            else:
-                loop.run_until_complete(sentinel.run_weekly_scan())
-                result = "✅ 每周扫描已完成"
-
-            loop.close()
+            try:
+                if scan_type == "daily":
+                    loop.run_until_complete(sentinel.run_daily_scan())
+                    result = "✅ 每日扫描已完成"
+                else:
+                    loop.run_until_complete(sentinel.run_weekly_scan())
+                    result = "✅ 每周扫描已完成"
+            finally:
+                loop.run_until_complete(sentinel.close())
+                loop.close()
             return result
 
         except Exception as e:
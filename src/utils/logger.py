@@ -1,6 +1,7 @@
 """
 日志工具
 """
+import atexit
 import logging
 import logging.handlers
 import sys
@@ -9,8 +10,13 @@ from typing import Optional
 from datetime import datetime
 
 
-def setup_logger(log_level: str = "INFO", log_file: Optional[str] = None, logger_name: str = "github_sentinel") -> logging.Logger:
-    """设置日志配置，支持按日期分文件存储"""
+def setup_logger(log_level: str = "INFO", log_file: Optional[str] = None, logger_name: str = "github_sentinel",
+                 buffered: bool = False) -> logging.Logger:
+    """设置日志配置，支持按日期分文件存储
+
+    buffered=True 时文件日志先缓存在内存中批量写入，只适合短时运行的命令行；
+    常驻的守护进程和Web服务应逐条写入，保证 tail -f 实时可见、崩溃时不丢日志。
+    """
     logger = logging.getLogger(logger_name)
 
     # 如果logger已经配置过，直接返回，避免重复配置
@@ -57,7 +63,18 @@ def setup_logger(log_level: str = "INFO", log_file: Optional[str] = None, logger
         )
         file_handler.setFormatter(formatter)
         file_handler.suffix = "%Y-%m-%d.log"
-        logger.addHandler(file_handler)
+
+        if buffered:
+            # 缓冲写入文件：每100条或遇到WARNING及以上时刷新，退出时刷新剩余记录
+            memory_handler = logging.handlers.MemoryHandler(
+                capacity=100,
+                flushLevel=logging.WARNING,
+                target=file_handler
+            )
+            atexit.register(memory_handler.flush)
+            logger.addHandler(memory_handler)
+        else:
+            logger.addHandler(file_handler)
 
     return logger
 
@@ -16,6 +16,8 @@ class TaskScheduler:
         self.is_running = False
         self.thread: Optional[threading.Thread] = None
         self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # 停止时置位，调度线程无需等满检查间隔即可退出
+        self._stop_event = threading.Event()
         self.logger = get_logger("github_sentinel.scheduler")
 
     def schedule_daily_task(self, task: Callable, time: str = "09:00"):
@@ -57,6 +59,7 @@ class TaskScheduler:
             return
 
         self.is_running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._run_scheduler, daemon=True)
         self.thread.start()
         self.logger.info("🚀 任务调度器已启动")
@@ -73,7 +76,7 @@ class TaskScheduler:
             while self.is_running:
                 schedule.run_pending()
                 # 每分钟检查一次待执行的任务
-                threading.Event().wait(60)
+                self._stop_event.wait(60)
 
         except Exception as e:
             self.logger.error(f"❌ 调度器运行出错: {e}", exc_info=True)
@@ -90,6 +93,7 @@ class TaskScheduler:
 
         self.logger.info("🛑 正在停止任务调度器...")
         self.is_running = False
+        self._stop_event.set()
 
         # 清除所有调度任务
         schedule.clear()
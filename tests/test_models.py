@@ -1,8 +1,10 @@
 """
 测试数据模型
 """
+import json
 import unittest
-from datetime import datetime
+from datetime import datetime, timezone
+from unittest.mock import patch
 import sys
 from pathlib import Path
 
@@ -12,6 +14,7 @@ sys.path.insert(0, str(project_root))
 from src.models.subscription import Subscription, NotificationType, UpdateFrequency, UpdateType
 from src.models.repository import RepositoryUpdate, Repository
 from src.models.report import Report
+from src.models.notification import NotificationPayload
 
 
 class TestSubscriptionModel(unittest.TestCase):
@@ -72,6 +75,28 @@ class TestRepositoryModel(unittest.TestCase):
         self.assertEqual(update.update_type, "commits")
 
 
+class TestNotificationModel(unittest.TestCase):
+    """测试通知模型"""
+
+    def test_payload_to_dict_channel_is_plain_string(self):
+        """测试序列化后的渠道为普通字符串"""
+        data = NotificationPayload.create_slack("subject", "body").to_dict()
+        self.assertIs(type(data['channel']), str)
+        self.assertEqual(f"{data['channel']}", "slack")
+
+    def test_payload_to_dict_results_are_independent(self):
+        """测试多次调用 to_dict 返回的字典互不影响"""
+        payload = NotificationPayload.create_email("subject", "body", ["a@example.com"])
+        first = payload.to_dict()
+        first['subject'] = "changed"
+        first['metadata']['key'] = "value"
+
+        second = payload.to_dict()
+        self.assertIsNot(first, second)
+        self.assertEqual(second['subject'], "subject")
+        self.assertEqual(second['metadata'], {})
+
+
 class TestReportModel(unittest.TestCase):
     """测试报告模型"""
 
@@ -114,6 +139,69 @@ class TestReportModel(unittest.TestCase):
         text = report.to_text()
         self.assertIn("暂无更新", text)
 
+    def test_add_update_invalidates_cached_output(self):
+        """测试添加更新后重新渲染缓存的文本"""
+        report = Report(report_type="daily", updates=[])
+        self.assertIs(report.to_text(), report.to_text())
+
+        report.add_update(RepositoryUpdate(
+            repo_name="repo1",
+            owner="owner1",
+            update_type="commits",
+            title="Commit 1",
+            description=None,
+            url="https://github.com/owner1/repo1/commit/1",
+            author="user1",
+            created_at=datetime.now()
+        ))
+        self.assertIn("Commit 1", report.to_text())
+        self.assertEqual(report.summary['total_updates'], 1)
+
+    def test_report_to_json_bytes(self):
+        """测试报告直接序列化为JSON字节"""
+        report = Report(report_type="daily", generated_at=datetime(2024, 1, 2, 3, 4, 5), updates=[
+            RepositoryUpdate(
+                repo_name="repo1",
+                owner="owner1",
+                update_type="issues",
+                title="Issue 1",
+                description=None,
+                url="https://github.com/owner1/repo1/issues/1",
+                author="user1",
+                created_at=datetime(2024, 1, 1)
+            )
+        ])
+        report.generate_summary()
+
+        data = json.loads(report.to_json_bytes())
+        self.assertEqual(data['generated_at'], "2024-01-02T03:04:05")
+        self.assertEqual(data['updates'][0]['title'], "Issue 1")
+        self.assertEqual(data['summary']['total_updates'], 1)
+
+    def test_report_json_bytes_matches_without_orjson(self):
+        """测试有无 orjson 时序列化出的字段和取值一致"""
+        report = Report(report_type="daily", generated_at=datetime(2024, 1, 2, tzinfo=timezone.utc), updates=[
+            RepositoryUpdate(
+                repo_name="repo1",
+                owner="owner1",
+                update_type="commits",
+                title="Commit 1",
+                description=None,
+                url="https://github.com/owner1/repo1/commit/1",
+                author="user1",
+                created_at=datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc),
+                metadata={"sha": "abc"}
+            )
+        ])
+        report.generate_summary()
+
+        with_orjson = json.loads(report.to_json_bytes())
+        with patch.dict(sys.modules, {'orjson': None}):
+            without_orjson = json.loads(report.to_json_bytes())
+
+        self.assertEqual(with_orjson, without_orjson)
+        self.assertNotIn('full_repo', with_orjson['updates'][0])
+
 
 if __name__ == '__main__':
     unittest.main()
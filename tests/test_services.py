@@ -3,6 +3,7 @@
 """
 import unittest
 import asyncio
+import tempfile
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, timedelta
 
@@ -15,10 +16,25 @@ from src.models.subscription import Subscription, NotificationType, UpdateFreque
 from src.models.repository import RepositoryUpdate
 from src.services.subscription_service import SubscriptionService
 from src.services.github_service import GitHubService
+from src.services.etag_store import EtagStore
 from src.services.update_service import UpdateService
 from src.config.settings import Settings, GitHubConfig, NotificationConfig, DatabaseConfig
 
 
+def _fake_session(responses, sent_headers):
+    """模拟 aiohttp 会话：按顺序返回 (状态码, 响应头, 响应体)，并记录每次请求的请求头"""
+    def fake_get(url, params=None, headers=None, timeout=None):
+        status, resp_headers, body = responses.pop(0)
+        sent_headers.append(headers)
+        response = Mock(status=status, headers=resp_headers, links={})
+        response.json = AsyncMock(return_value=body)
+        ctx = AsyncMock()
+        ctx.__aenter__.return_value = response
+        return ctx
+
+    return Mock(closed=False, get=fake_get)
+
+
 class TestSubscriptionService(unittest.TestCase):
     """测试订阅服务"""
 
@@ -48,6 +64,8 @@ class TestSubscriptionService(unittest.TestCase):
         owner, repo = Subscription.parse_repo_url("https://github.com/owner/repo")
         self.assertEqual(owner, "owner")
         self.assertEqual(repo, "repo")
+        self.assertEqual(Subscription.parse_repo_url("http://github.com/owner/repo.git"), ("owner", "repo"))
+        self.assertEqual(Subscription.parse_repo_url("https://github.com/owner/repo/tree/main"), ("owner", "repo"))
 
         with self.assertRaises(ValueError):
             Subscription.parse_repo_url("invalid_url")
@@ -81,6 +99,245 @@ class TestGitHubService(unittest.TestCase):
         self.assertEqual(repo.name, "test-repo")
         self.assertEqual(repo.owner, "owner")
 
+    def test_shared_session_not_closed(self):
+        """测试外部传入的会话被复用且不由服务关闭"""
+        async def run():
+            import aiohttp
+            async with aiohttp.ClientSession() as session:
+                service = GitHubService("test_token", session=session)
+                self.assertIs(service._get_session(), session)
+                await service.close()
+                return session.closed
+
+        self.assertFalse(asyncio.run(run()))
+
+    def test_session_from_previous_loop_is_closed(self):
+        """测试事件循环更换时关闭旧循环上的会话，而不是直接丢弃"""
+        async def get_session():
+            return self.service._get_session()
+
+        loop = asyncio.new_event_loop()
+        first = loop.run_until_complete(get_session())
+        loop.close()
+
+        with patch.object(self.service, '_wait_for_rate_limit', AsyncMock(side_effect=RuntimeError("stop"))):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(self.service._request("https://api.github.com/x"))
+
+        self.assertTrue(first.closed)
+        self.assertIsNot(self.service._session, first)
+        asyncio.run(self.service.close())
+
+    def test_rate_limit_waits_until_reset_from_headers(self):
+        """测试配额耗尽时按响应头中的重置时间等待"""
+        import time
+        reset = time.time() + 5
+        self.service._update_rate_limit({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)})
+
+        with patch('asyncio.sleep', AsyncMock()) as sleep:
+            asyncio.run(self.service._wait_for_rate_limit())
+
+        self.assertAlmostEqual(sleep.await_args.args[0], 5, delta=1)
+        self.assertEqual(self.service._remaining, self.service.rate_limit_per_hour)
+
+    def test_search_rate_limit_headers_do_not_touch_core_quota(self):
+        """测试Search API的配额响应头不覆盖core配额"""
+        import time
+        reset = time.time() + 60
+        self.service._update_rate_limit({
+            'X-RateLimit-Resource': 'search', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)
+        })
+        self.assertEqual(self.service._remaining, self.service.rate_limit_per_hour)
+
+        self.service._update_rate_limit({
+            'X-RateLimit-Resource': 'core', 'X-RateLimit-Remaining': '42', 'X-RateLimit-Reset': str(reset)
+        })
+        self.assertEqual(self.service._remaining, 42)
+
+    def test_paginate_follows_next_link_until_stop(self):
+        """测试分页沿 Link 头继续获取，并在条目早于截止条件时停止"""
+        pages = [
+            ([{"n": 3}, {"n": 2}], "https://api.github.com/page2"),
+            ([{"n": 1}, {"n": 0}], "https://api.github.com/page3"),
+        ]
+        with patch.object(self.service, '_request', AsyncMock(side_effect=pages)) as request:
+            items = asyncio.run(self.service._paginate(
+                "https://api.github.com/page1", {"per_page": 2}, stop=lambda item: item["n"] < 1
+            ))
+
+        self.assertEqual([item["n"] for item in items], [3, 2, 1])
+        self.assertEqual(request.await_count, 2)
+        self.assertEqual(request.await_args.args, ("https://api.github.com/page2", None))
+
+    def test_get_recent_issues_via_search(self):
+        """测试开启 use_search 时通过Search API获取issues"""
+        service = GitHubService("test_token", use_search=True)
+        issue = {
+            "number": 1, "title": "Bug", "body": None, "state": "open", "labels": [],
+            "html_url": "https://github.com/owner/repo/issues/1",
+            "user": {"login": "user1"}, "created_at": "2024-01-02T00:00:00Z",
+            "updated_at": "2024-01-02T00:00:00Z"
+        }
+        request = AsyncMock(return_value=({"total_count": 1, "items": [issue]}, None))
+
+        with patch.object(service, '_request', request):
+            updates = asyncio.run(service.get_recent_issues("owner", "repo", datetime(2024, 1, 1)))
+
+        url, params = request.await_args.args
+        self.assertTrue(url.endswith("/search/issues"))
+        self.assertEqual(params['q'], "repo:owner/repo is:issue updated:>=2024-01-01T00:00:00Z")
+        self.assertEqual([u.title for u in updates], ["Bug"])
+
+    def test_conditional_request_returns_cached_on_304(self):
+        """测试带ETag的条件请求在304时返回缓存数据"""
+        responses = [(200, {'ETag': '"v1"'}, [{"id": 1}]), (304, {}, None)]
+        sent_headers = []
+        session = _fake_session(responses, sent_headers)
+        service = GitHubService("test_token", session=session)
+
+        async def run():
+            first = await service._make_request("https://api.github.com/x", {"per_page": 100})
+            second = await service._make_request("https://api.github.com/x", {"per_page": 100})
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first, second)
+        self.assertNotIn('If-None-Match', sent_headers[0])
+        self.assertEqual(sent_headers[1]['If-None-Match'], '"v1"')
+
+    def test_etag_store_survives_restart(self):
+        """测试磁盘ETag存储在新的服务实例中仍可发送条件请求"""
+        responses = [(200, {'ETag': '"v1"'}, [{"id": 1}]), (304, {}, None)]
+        sent_headers = []
+        session = _fake_session(responses, sent_headers)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / ".etag.db"
+            results = []
+            for _ in range(2):
+                store = EtagStore(db_path)
+                service = GitHubService("test_token", session=session, etag_store=store)
+                results.append(asyncio.run(
+                    service._make_request("https://api.github.com/x", {"per_page": 100})
+                ))
+                store.close()
+
+        self.assertEqual(results, [[{"id": 1}], [{"id": 1}]])
+        self.assertEqual(sent_headers[1]['If-None-Match'], '"v1"')
+
+    def test_since_rounding_reuses_etag_across_runs(self):
+        """测试相隔几秒的两次运行使用相同的 since 参数，第二次发送条件请求"""
+        issue = {
+            "number": 1, "title": "Bug", "body": None, "state": "open", "labels": [],
+            "html_url": "https://github.com/owner/repo/issues/1",
+            "user": {"login": "user1"}, "created_at": "2024-01-02T10:20:00Z",
+            "updated_at": "2024-01-02T10:20:00Z"
+        }
+        responses = [(200, {'ETag': '"v1"'}, [issue]), (304, {}, None)]
+        sent_headers = []
+        session = _fake_session(responses, sent_headers)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "etag.db"
+            titles = []
+            for since in (datetime(2024, 1, 2, 10, 15, 3), datetime(2024, 1, 2, 10, 15, 9)):
+                store = EtagStore(db_path)
+                service = GitHubService("test_token", session=session, etag_store=store)
+                updates = asyncio.run(service.get_recent_issues("owner", "repo", since))
+                titles.append([u.title for u in updates])
+                store.close()
+
+        self.assertEqual(titles, [["Bug"], ["Bug"]])
+        self.assertNotIn('If-None-Match', sent_headers[0])
+        self.assertEqual(sent_headers[1]['If-None-Match'], '"v1"')
+
+    def test_etag_store_bounds_entries(self):
+        """测试ETag存储忽略过期条目，并在打开时只保留最近的条目"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "etag.db"
+            store = EtagStore(db_path)
+            for i in range(3):
+                store.set(f"https://api.github.com/{i}", f'"{i}"', [i])
+            store.max_age = -1
+            self.assertIsNone(store.get("https://api.github.com/2"))
+            store.close()
+
+            store = EtagStore(db_path, max_entries=2)
+            self.assertIsNone(store.get("https://api.github.com/0"))
+            self.assertEqual(store.get("https://api.github.com/2"), ('"2"', [2], None))
+            store.close()
+
+    def test_malformed_item_is_skipped(self):
+        """测试单条数据缺少字段（包括时间字段）时跳过该条，其余正常返回"""
+        release = {
+            "name": "v1.0", "tag_name": "v1.0", "body": None, "prerelease": False, "draft": False,
+            "html_url": "https://github.com/owner/repo/releases/v1.0",
+            "author": {"login": "user1"}, "created_at": "2024-01-02T00:00:00Z"
+        }
+        broken = dict(release, author=None)
+        undated = {k: v for k, v in release.items() if k != "created_at"}
+        later = dict(release, name="v1.1", tag_name="v1.1")
+        request = AsyncMock(return_value=([release, broken, undated, later], None))
+
+        with patch.object(self.service, '_request', request):
+            updates = asyncio.run(self.service.get_recent_releases("owner", "repo", datetime(2024, 1, 1)))
+
+        self.assertEqual([u.title for u in updates], ["v1.0", "v1.1"])
+
+    def test_rebased_commit_does_not_stop_pagination(self):
+        """测试作者时间早于since的变基提交不会截断后续提交"""
+        def commit(sha, author_date, committer_date):
+            return {
+                "sha": sha, "html_url": f"https://github.com/owner/repo/commit/{sha}",
+                "commit": {
+                    "message": f"commit {sha}",
+                    "author": {"name": "user1", "date": author_date},
+                    "committer": {"name": "user1", "date": committer_date}
+                }
+            }
+
+        page = [
+            commit("a", "2024-01-03T00:00:00Z", "2024-01-03T00:00:00Z"),
+            commit("b", "2023-06-01T00:00:00Z", "2024-01-02T12:00:00Z"),
+            commit("c", "2024-01-02T00:00:00Z", "2024-01-02T00:00:00Z"),
+        ]
+        with patch.object(self.service, '_request', AsyncMock(return_value=(page, None))):
+            updates = asyncio.run(self.service.get_recent_commits("owner", "repo", datetime(2024, 1, 1)))
+
+        self.assertEqual([u.metadata["sha"] for u in updates], ["a", "b", "c"])
+
+    def test_token_bucket_paces_when_empty(self):
+        """测试令牌用尽时按补充速率等待，而不是等待整个小时"""
+        service = GitHubService("test_token", rate_limit_per_hour=3600)
+        service._tokens = 0.5
+
+        async def fake_sleep(delay):
+            service._last_refill -= delay
+
+        with patch('asyncio.sleep', side_effect=fake_sleep) as sleep:
+            asyncio.run(service._wait_for_rate_limit())
+
+        self.assertAlmostEqual(sleep.call_args.args[0], 0.5, delta=0.05)
+        self.assertLess(service._tokens, 1)
+
+    def test_get_all_updates_skips_failed_type(self):
+        """测试并发获取多种更新时单个类型失败不影响其他类型"""
+        since = datetime.now() - timedelta(days=1)
+        update = RepositoryUpdate(
+            repo_name="repo", owner="owner", update_type="commits",
+            title="Fix bug", description=None, url="https://github.com",
+            author="user", created_at=datetime.now()
+        )
+
+        with patch.object(self.service, 'get_recent_commits', AsyncMock(return_value=[update])), \
+                patch.object(self.service, 'get_recent_issues', AsyncMock(side_effect=Exception("boom"))), \
+                patch.object(self.service, 'get_recent_releases', AsyncMock(return_value=[])) as releases:
+            updates = asyncio.run(self.service.get_all_updates(
+                "owner", "repo", since, types={"commits", "issues"}
+            ))
+
+        self.assertEqual(updates, [update])
+        releases.assert_not_called()
+
 
 class TestUpdateService(unittest.TestCase):
     """测试更新服务"""
@@ -125,6 +382,31 @@ class TestUpdateService(unittest.TestCase):
         self.assertEqual(len(filtered), 1)
         self.assertEqual(filtered[0].author, "user1")
 
+    def test_iter_updates_streams_by_completion(self):
+        """测试更新按仓库完成顺序流式产出"""
+        subs = [
+            Subscription.create_from_url(
+                repo_url=f"https://github.com/owner/{name}",
+                notification_types=[NotificationType.EMAIL],
+                frequency=UpdateFrequency.DAILY
+            )
+            for name in ("slow", "fast")
+        ]
+
+        async def fake_fetch(sub, since):
+            await asyncio.sleep(0.05 if sub.repo_name == "slow" else 0)
+            return [RepositoryUpdate(
+                repo_name=sub.repo_name, owner=sub.owner, update_type="commits",
+                title=f"{sub.repo_name} commit", description=None,
+                url="https://github.com", author="user", created_at=datetime.now()
+            )]
+
+        async def collect():
+            return [u.repo_name async for u in self.service.iter_updates(subs)]
+
+        with patch.object(self.service, '_fetch_single_repo_updates', side_effect=fake_fetch):
+            self.assertEqual(asyncio.run(collect()), ["fast", "slow"])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -15,7 +15,9 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.services.github_service import GitHubService
-from src.services.llm_service import LLMService
+from src.models.repository import IssueRow, PullRequestRow
+from src.services.llm_service import LLMService, load_template
+from src.services.llm_cache import LLMResponseCache
 from src.services.report_service import ReportService
 from src.cli.commands import GitHubSentinelCLI
 from src.config.settings import Settings
@@ -54,7 +56,7 @@ class TestGitHubServiceV02:
             }
         ]
 
-        with patch.object(github_service, '_make_request', return_value=mock_data):
+        with patch.object(github_service, '_request', return_value=(mock_data, None)):
             # 测试获取closed issues - GitHub API返回所有数据，由get_issues方法过滤
             issues = await github_service.get_issues(
                 "test", "repo", state="closed", include_body=False
@@ -64,7 +66,7 @@ class TestGitHubServiceV02:
             assert len(issues) >= 1
             # 验证不包含body内容
             for issue in issues:
-                assert 'body' not in issue
+                assert issue.body is None
 
     @pytest.mark.asyncio
     async def test_get_pull_requests_merged_only(self, github_service):
@@ -98,15 +100,15 @@ class TestGitHubServiceV02:
             }
         ]
 
-        with patch.object(github_service, '_make_request', return_value=mock_data):
+        with patch.object(github_service, '_request', return_value=(mock_data, None)):
             # 测试只获取merged PR
             prs = await github_service.get_pull_requests(
                 "test", "repo", merged_only=True, include_body=False
             )
 
             assert len(prs) == 1
-            assert prs[0]['merged_at'] is not None
-            assert prs[0]['title'] == 'Test PR 1'
+            assert prs[0].merged_at is not None
+            assert prs[0].title == 'Test PR 1'
 
     @pytest.mark.asyncio
     async def test_export_daily_progress_compact_mode(self, github_service):
@@ -114,32 +116,31 @@ class TestGitHubServiceV02:
         with tempfile.TemporaryDirectory() as temp_dir:
             # Mock GitHub API responses with correct structure
             mock_issues = [
-                {
-                    'number': 1,
-                    'title': 'Fixed bug',
-                    'state': 'closed',
-                    'user': {'login': 'developer'},
-                    'created_at': '2025-10-08T10:00:00Z',
-                    'updated_at': '2025-10-08T12:00:00Z',
-                    'html_url': 'https://github.com/test/repo/issues/1',
-                    'labels': ['bug']
-                }
+                IssueRow(
+                    number=1,
+                    title='Fixed bug',
+                    state='closed',
+                    user='developer',
+                    created_at='2025-10-08T10:00:00Z',
+                    updated_at='2025-10-08T12:00:00Z',
+                    html_url='https://github.com/test/repo/issues/1',
+                    labels=('bug',)
+                )
             ]
 
             mock_prs = [
-                {
-                    'number': 1,
-                    'title': 'Add new feature',
-                    'state': 'closed',
-                    'user': {'login': 'developer'},
-                    'created_at': '2025-10-08T10:00:00Z',
-                    'updated_at': '2025-10-08T12:00:00Z',
-                    'html_url': 'https://github.com/test/repo/pull/1',
-                    'merged_at': '2025-10-08T12:00:00Z',
-                    'draft': False,
-                    'base_branch': 'main',
-                    'head_branch': 'feature'
-                }
+                PullRequestRow(
+                    number=1,
+                    title='Add new feature',
+                    state='closed',
+                    user='developer',
+                    created_at='2025-10-08T10:00:00Z',
+                    updated_at='2025-10-08T12:00:00Z',
+                    html_url='https://github.com/test/repo/pull/1',
+                    base_branch='main',
+                    head_branch='feature',
+                    merged_at='2025-10-08T12:00:00Z'
+                )
             ]
 
             with patch.object(github_service, 'get_issues', return_value=mock_issues), \
@@ -160,6 +161,24 @@ class TestGitHubServiceV02:
                 assert "Add new feature" in content
                 assert "Fixed bug" in content
 
+    @pytest.mark.asyncio
+    async def test_export_daily_progress_bulk(self, github_service):
+        """测试批量导出保持顺序，单个仓库失败不影响其他仓库"""
+        async def fake_export(owner, repo, **kwargs):
+            if repo == "broken":
+                raise Exception("boom")
+            return f"{kwargs['output_dir']}/{repo}.md"
+
+        with patch.object(github_service, 'export_daily_progress', side_effect=fake_export):
+            results = await github_service.export_daily_progress_bulk(
+                [("test", "a"), ("test", "broken"), ("test", "b")],
+                concurrency=2, output_dir="out"
+            )
+
+        assert results[0] == "out/a.md"
+        assert isinstance(results[1], Exception)
+        assert results[2] == "out/b.md"
+
 
 class TestLLMServiceV02:
     """测试LLM服务v0.2功能"""
@@ -209,6 +228,86 @@ class TestLLMServiceV02:
                 call_args = mock_generate.call_args
                 assert call_args[1]['max_tokens'] == 1500
 
+    @pytest.mark.asyncio
+    async def test_generate_chat_uses_response_cache(self, tmp_path):
+        """测试相同请求命中LLM响应缓存"""
+        llm_service = LLMService(cache=LLMResponseCache(str(tmp_path / "llm_cache.db")))
+        mock_provider = MagicMock()
+        mock_provider.model_name = "gpt-4"
+        mock_provider.generate_chat_completion = AsyncMock(return_value="cached summary")
+        llm_service.add_provider("test", mock_provider, is_default=True)
+
+        messages = [{"role": "user", "content": "summarize"}]
+        first = await llm_service.generate_chat(messages, max_tokens=1200)
+        second = await llm_service.generate_chat(messages, "test", max_tokens=1200)
+        await llm_service.generate_chat(messages, max_tokens=800)
+
+        assert first == second == "cached summary"
+        # 参数不同的请求不命中缓存
+        assert mock_provider.generate_chat_completion.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_generate_chat_cache_bypass_and_expiry(self, tmp_path):
+        """测试 use_cache=False 绕过缓存，过期条目不再命中"""
+        cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+        llm_service = LLMService(cache=cache)
+        mock_provider = MagicMock()
+        mock_provider.model_name = "gpt-4"
+        mock_provider.generate_chat_completion = AsyncMock(return_value="reply")
+        llm_service.add_provider("test", mock_provider, is_default=True)
+
+        messages = [{"role": "user", "content": "ping"}]
+        await llm_service.generate_chat(messages)
+        await llm_service.generate_chat(messages, use_cache=False)
+        assert mock_provider.generate_chat_completion.call_count == 2
+
+        cache.max_age = -1
+        await llm_service.generate_chat(messages)
+        assert mock_provider.generate_chat_completion.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_generate_summary_reports_batch(self, llm_service):
+        """测试通过Batch API批量生成摘要报告"""
+        mock_provider = MagicMock()
+        mock_provider.supports_batch = True
+        mock_provider.run_batch_chat_completions = AsyncMock(return_value={"a/x": "summary x"})
+        llm_service.add_provider("openai", mock_provider, is_default=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = await llm_service.generate_summary_reports_batch(
+                [
+                    {"key": "a/x", "repo_name": "x", "markdown_content": "# x"},
+                    {"key": "a/y", "repo_name": "y", "markdown_content": "# y"},
+                ],
+                output_dir=temp_dir,
+                max_tokens=1200
+            )
+
+            # 一次提交全部请求，未返回结果的条目不在结果中
+            requests = mock_provider.run_batch_chat_completions.call_args[0][0]
+            assert set(requests) == {"a/x", "a/y"}
+            assert list(result) == ["a/x"]
+            assert Path(result["a/x"]).read_text(encoding="utf-8") == "summary x"
+
+    def test_load_template_cached_until_modified(self, tmp_path):
+        """测试模板只读取一次，文件修改后重新读取"""
+        import os
+        template = tmp_path / "prompt.txt"
+        template.write_text("v1", encoding="utf-8")
+
+        with patch("builtins.open", wraps=open) as mock_open:
+            assert load_template(str(template)) == "v1"
+            assert load_template(str(template)) == "v1"
+            assert mock_open.call_count == 1
+
+        template.write_text("v2", encoding="utf-8")
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert load_template(str(template)) == "v2"
+
+        with pytest.raises(FileNotFoundError):
+            load_template(str(tmp_path / "missing.txt"))
+
 
 class TestReportServiceV02:
     """测试报告服务v0.2功能"""
@@ -260,6 +359,37 @@ class TestReportServiceV02:
         assert "progress_report" in results[0]
         assert "error" in results[1]
 
+    @pytest.mark.asyncio
+    async def test_compare_fans_out_templates_and_providers(self, report_service):
+        """测试对比报告对模板 × 提供商组合并发生成，并按提供商限制并发"""
+        report_service.generate_daily_progress_report = AsyncMock(return_value="progress.md")
+        running = {"azure": 0, "openai": 0}
+        peak = {"azure": 0, "openai": 0}
+
+        async def mock_summary(label, progress_file, template, provider_name, **kwargs):
+            running[provider_name] += 1
+            peak[provider_name] = max(peak[provider_name], running[provider_name])
+            await asyncio.sleep(0.01)
+            running[provider_name] -= 1
+            if provider_name == "openai" and template == "b.txt":
+                raise Exception("quota")
+            return f"{label}.md"
+
+        report_service.generate_llm_summary_report = AsyncMock(side_effect=mock_summary)
+        streamed = []
+
+        result = await report_service.generate_report_with_multiple_templates(
+            "owner", "repo", ["a.txt", "b.txt", "c.txt"], ["azure", "openai"],
+            per_provider_concurrency=2, on_result=streamed.append
+        )
+
+        summaries = result["summaries"]
+        assert len(summaries) == len(streamed) == 6
+        report_service.generate_daily_progress_report.assert_awaited_once()
+        assert summaries[0] == {"template": "a.txt", "provider": "azure", "summary_file": "repo_a_azure.md"}
+        assert summaries[3]["error"] == "quota"
+        assert peak == {"azure": 2, "openai": 2}
+
     def test_get_report_history(self, report_service):
         """测试获取报告历史"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -295,10 +425,10 @@ class TestCLICommandsV02:
 
     @pytest.fixture
     def cli(self, mock_settings):
-        with patch('src.cli.commands.Settings.from_env', return_value=mock_settings), \
-             patch('src.cli.commands.Settings.from_config_file', return_value=mock_settings), \
+        with patch('src.cli.commands.get_settings', return_value=mock_settings), \
              patch('src.cli.commands.setup_logger'):
-            return GitHubSentinelCLI()
+            # 服务为延迟创建，需在patch生效期间使用
+            yield GitHubSentinelCLI()
 
     def test_parser_creation_v02_commands(self, cli):
         """测试v0.2新命令的解析器创建"""
@@ -318,6 +448,23 @@ class TestCLICommandsV02:
             for cmd in v02_commands:
                 assert cmd in subparser_choices
 
+    def test_parser_builds_only_requested_command(self, cli):
+        """测试只完整构建请求的子命令"""
+        argv = ['history', 'vscode', '--limit', '3']
+        parser = cli.create_parser(argv)
+        args = parser.parse_args(argv)
+
+        assert args.func == cli._handle_report_history
+        assert args.limit == 3
+
+        subparsers_action = next(
+            action for action in parser._actions
+            if isinstance(action, argparse._SubParsersAction)
+        )
+        # 其余子命令只注册了名称，没有添加参数
+        assert 'progress' in subparsers_action.choices
+        assert len(subparsers_action.choices['progress']._actions) == 1
+
     @pytest.mark.asyncio
     async def test_handle_progress_report_command(self, cli):
         """测试进展报告命令处理"""
@@ -358,6 +505,39 @@ class TestCLICommandsV02:
 
         cli.llm_service.list_providers.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_handle_batch_reports_respects_concurrency(self, cli, tmp_path):
+        """测试批量报告命令按 --concurrent 限制并发"""
+        repos_file = tmp_path / "repos.json"
+        repos_file.write_text(json.dumps([
+            {"owner": "owner", "repo": f"repo{i}"} for i in range(5)
+        ]), encoding="utf-8")
+
+        running = 0
+        peak = 0
+
+        async def fake_report(owner, repo, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"repository": f"{owner}/{repo}"}
+
+        cli.report_service.generate_complete_daily_report = AsyncMock(side_effect=fake_report)
+
+        args = MagicMock()
+        args.repos_file = str(repos_file)
+        args.template = "github_azure_prompt.txt"
+        args.provider = None
+        args.concurrent = 2
+        args.use_batch_api = False
+
+        await cli._handle_batch_reports(args)
+
+        assert cli.report_service.generate_complete_daily_report.call_count == 5
+        assert peak == 2
+
 
 class TestTokenOptimization:
     """测试token优化功能"""